@@ -26,7 +26,9 @@ logger.setLevel(logging.INFO)
 async def lifespan(app: FastAPI):
     # Startup
     from src.kafka.consumer import ticket_result_consumer
+    from src.utils.cache import listen_for_invalidations
     consumer_task = asyncio.create_task(ticket_result_consumer.start_consuming())
+    listen_for_invalidations()
     logger.info("API consumer services initialized")
     yield
 
@@ -0,0 +1,19 @@
+import argparse
+import logging
+import os
+
+from src.utils.config import settings
+
+# Only the processor runs in multiprocess mode; must be set before prometheus_client is imported
+os.environ['PROMETHEUS_MULTIPROC_DIR'] = settings.PROCESSOR_METRICS_DIR
+
+from src.kafka.supervisor import run_supervisor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(processName)s %(name)s %(levelname)s %(message)s')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run ticket processor workers in one consumer group")
+    parser.add_argument('--workers', type=int, default=settings.PROCESSOR_WORKERS,
+                        help="number of worker processes, each owning a share of the partitions")
+    args = parser.parse_args()
+    run_supervisor(args.workers)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
@@ -5,7 +6,8 @@ from src.repositories.venue_repository import venue_repository
 from src.repositories.concert_repository import concert_repository
 from src.repositories.zone_repository import zone_repository
 from src.repositories.ticket_repository import ticket_repository
-from src.utils.cache import invalidate_cache
+from src.utils.cache import ainvalidate_tag, concert_tag, listen_for_invalidations
+from src.utils.concert_weights import concert_weights
 from src.dto import (
     venue as venue_schemas,
     concert as concert_schemas,
@@ -17,7 +19,14 @@ import logging_loki
 
 from src.utils.observablity import PrometheusMiddleware, metrics, setting_otlp
 
-app = FastAPI(title="Admin Service", root_path="/admin")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    listen_for_invalidations()
+    logger.info("Admin service initialized")
+    yield
+
+app = FastAPI(title="Admin Service", lifespan=lifespan, root_path="/admin")
 
 loki_handler = logging_loki.LokiHandler(
     url="http://localhost:3100/loki/api/v1/push",
@@ -113,13 +122,23 @@ async def update_concert(concert_id: str, concert: concert_schemas.ConcertUpdate
         raise HTTPException(status_code=500, detail="Failed to update concert")
     return updated_concert
 
+@app.put("/concerts/{concert_id}/weight", response_model=concert_schemas.ConcertWeight)
+async def update_concert_weight(concert_id: str, weight: concert_schemas.ConcertWeight, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    existing_concert = await concert_repository.get(concert_id)
+    if not existing_concert:
+        logger.error("Concert not found for weight update")
+        raise HTTPException(status_code=404, detail="Concert not found")
+    await concert_weights.aset(concert_id, weight.weight)
+    return weight
+
 # Zone CRUD
 @app.post("/zones/", response_model=zone_schemas.Zone)
 async def create_zone(zone: zone_schemas.ZoneCreate, db: Session = Depends(get_db)):
     db_session_context.set(db)
     try:
         result = await zone_repository.create(zone)
-        invalidate_cache(zone.concert_id)
+        await ainvalidate_tag(concert_tag(zone.concert_id))
         return result
     except ValueError as e:
         error_msg = str(e)
@@ -151,9 +170,21 @@ async def update_zone(zone_id: str, zone: zone_schemas.ZoneUpdate, db: Session =
     if not updated_zone:
         logger.error("Failed to update zone")
         raise HTTPException(status_code=500, detail="Failed to update zone")
-    invalidate_cache(updated_zone.concert_id)
+    await ainvalidate_tag(concert_tag(updated_zone.concert_id))
     return updated_zone
 
+@app.put("/zones/{zone_id}/split", response_model=zone_schemas.ZoneSplit)
+async def split_zone(zone_id: str, split: zone_schemas.ZoneSplit, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    try:
+        zone = await zone_repository.split(zone_id, split.partitions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not zone:
+        logger.error("Zone not found for split")
+        raise HTTPException(status_code=404, detail="Zone not found")
+    return split
+
 # Ticket management (read-only, no ordering)
 @app.get("/tickets/{ticket_id}", response_model=ticket_schemas.TicketDetail)
 async def read_ticket(ticket_id: str, db: Session = Depends(get_db)):
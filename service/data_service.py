@@ -1,10 +1,13 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
 from src.repositories.concert_repository import concert_repository
 from src.repositories.venue_repository import venue_repository
 from src.repositories.zone_repository import zone_repository
 from src.repositories.ticket_repository import ticket_repository
+from src.utils.cache import listen_for_invalidations, build_cache_key
+from src.utils.response_cache import response_cache
 from src.utils.observablity import PrometheusMiddleware, metrics, setting_otlp
 from src.dto import (
     venue as venue_schemas,
@@ -15,7 +18,14 @@ from src.dto import (
 import logging
 import logging_loki
 
-app = FastAPI(title="Data Service", root_path="/data")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    listen_for_invalidations()
+    logger.info("Data service initialized")
+    yield
+
+app = FastAPI(title="Data Service", lifespan=lifespan, root_path="/data")
 
 loki_handler = logging_loki.LokiHandler(
     url="http://localhost:3100/loki/api/v1/push",
@@ -54,33 +64,48 @@ async def read_venue(venue_id: str, db: Session = Depends(get_db)):
 
 # Read-only concert endpoints
 @app.get("/concerts/{concert_id}", response_model=concert_schemas.ConcertDetail)
-async def read_concert(concert_id: str, db: Session = Depends(get_db)):
-    db_session_context.set(db)
-    concert = await concert_repository.get(concert_id)
-    if not concert:
-        logger.error("Concert not found")
-        raise HTTPException(status_code=404, detail="Concert not found")
-    return concert
+async def read_concert(concert_id: str, request: Request, db: Session = Depends(get_db)):
+    rendered = await response_cache.get(build_cache_key('concert', concert_id))
+    if rendered is None:
+        db_session_context.set(db)
+        concert = await concert_repository.get(concert_id)
+        if not concert:
+            logger.error("Concert not found")
+            raise HTTPException(status_code=404, detail="Concert not found")
+        if not response_cache.enabled:
+            return concert
+        rendered = await response_cache.render(build_cache_key('concert', concert_id), concert_schemas.ConcertDetail, concert)
+    return response_cache.respond(rendered, request)
 
 # Read-only zone endpoints
 @app.get("/zones/{zone_id}", response_model=zone_schemas.Zone)
-async def read_zone(zone_id: str, db: Session = Depends(get_db)):
-    db_session_context.set(db)
-    zone = await zone_repository.get(zone_id)
-    if not zone:
-        logger.error("Zone not found")
-        raise HTTPException(status_code=404, detail="Zone not found")
-    return zone
+async def read_zone(zone_id: str, request: Request, db: Session = Depends(get_db)):
+    rendered = await response_cache.get(build_cache_key('zone', zone_id))
+    if rendered is None:
+        db_session_context.set(db)
+        zone = await zone_repository.get(zone_id)
+        if not zone:
+            logger.error("Zone not found")
+            raise HTTPException(status_code=404, detail="Zone not found")
+        if not response_cache.enabled:
+            return zone
+        rendered = await response_cache.render(build_cache_key('zone', zone_id), zone_schemas.Zone, zone)
+    return response_cache.respond(rendered, request)
 
 # Read-only ticket endpoints
 @app.get("/tickets/{ticket_id}", response_model=ticket_schemas.TicketDetail)
-async def read_ticket(ticket_id: str, db: Session = Depends(get_db)):
-    db_session_context.set(db)
-    ticket = await ticket_repository.get_with_details(ticket_id)
-    if not ticket:
-        logger.error("Ticket not found")
-        raise HTTPException(status_code=404, detail="Ticket not found")
-    return ticket
+async def read_ticket(ticket_id: str, request: Request, db: Session = Depends(get_db)):
+    rendered = await response_cache.get(build_cache_key('ticket_detail', ticket_id))
+    if rendered is None:
+        db_session_context.set(db)
+        ticket = await ticket_repository.get_with_details(ticket_id)
+        if not ticket:
+            logger.error("Ticket not found")
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        if not response_cache.enabled:
+            return ticket
+        rendered = await response_cache.render(build_cache_key('ticket_detail', ticket_id), ticket_schemas.TicketDetail, ticket)
+    return response_cache.respond(rendered, request)
 
 @app.get("/tickets/concert/{concert_id}", response_model=list[ticket_schemas.Ticket])
 async def read_tickets_by_concert(concert_id: str, db: Session = Depends(get_db)):
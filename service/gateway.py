@@ -4,7 +4,8 @@ from urllib.parse import unquote
 import asyncio
 import os
 from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import logging_loki
@@ -67,6 +68,9 @@ SERVICES = {
 # Global HTTP client
 http_client = None
 
+# Headers describing the upstream connection or encoding rather than the body passed on
+HOP_BY_HOP_HEADERS = {'connection', 'content-encoding', 'content-length', 'transfer-encoding'}
+
 keycloak_config = KeycloakConfiguration(
     realm=os.getenv("REALM_NAME"),
     url=os.getenv("KEYCLOAK_URL"),
@@ -162,21 +166,35 @@ async def proxy_request_handler(service_name: str, path: str, request: Request):
         if request.method in ["POST", "PUT", "PATCH"]:
             body = await request.body()
 
-        response = await http_client.request(
+        # Event streams stay open between events, so only the connect timeout applies to them
+        streaming = 'text/event-stream' in request.headers.get('accept', '') or decoded_path.endswith('/events')
+        upstream_request = http_client.build_request(
             method=request.method,
             url=target_url,
             headers={k: v for k, v in request.headers.items()
                      if k.lower() not in ['host', 'content-length']},
             content=body,
+            timeout=httpx.Timeout(5.0, connect=2.0, read=None) if streaming else httpx.USE_CLIENT_DEFAULT,
         )
+        response = await http_client.send(upstream_request, stream=True)
         logger.info(f"Proxying {request.method} request to {service_name} at {target_url}")
 
-        return JSONResponse(
-            status_code=response.status_code,
-            content=response.json() if response.content else None,
-            headers={k: v for k, v in response.headers.items()
-                     if k.lower() not in ['content-encoding', 'transfer-encoding']}
-        )
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+
+        if response.headers.get('content-type', '').startswith('text/event-stream'):
+            return StreamingResponse(
+                response.aiter_bytes(),
+                status_code=response.status_code,
+                headers=headers,
+                background=BackgroundTask(response.aclose)
+            )
+
+        # Other bodies, including pre-rendered cached responses, are passed on byte for byte
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        return Response(content=content, status_code=response.status_code, headers=headers)
 
     except httpx.RequestError as e:
         logger.error(f"Request failed to {service_name}: {e}")
@@ -1,6 +1,7 @@
 import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
 from src.repositories.ticket_repository import ticket_repository
@@ -29,7 +30,9 @@ logger.setLevel(logging.INFO)
 async def lifespan(app: FastAPI):
     # Startup
     from src.kafka.consumer import ticket_result_consumer
+    from src.utils.cache import listen_for_invalidations
     consumer_task = asyncio.create_task(ticket_result_consumer.start_consuming())
+    listen_for_invalidations()
     logger.info("Ticket ordering service initialized")
     yield
 
@@ -79,6 +82,46 @@ async def create_ticket(ticket: ticket_schemas.TicketCreate, db: Session = Depen
         logger.error(f"Unexpected error creating ticket: {e}")
         raise HTTPException(status_code=500, detail="Failed to create ticket")
 
+@app.post("/tickets/orders", response_model=ticket_schemas.TicketOrderStatus, status_code=202)
+async def create_ticket_order(ticket: ticket_schemas.TicketCreate, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    try:
+        ticket_id = await ticket_repository.create_async(ticket)
+        return ticket_schemas.TicketOrderStatus(ticket_id=ticket_id, status='pending')
+    except ValueError as e:
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            logger.error(error_msg)
+            raise HTTPException(status_code=404, detail=error_msg)
+        else:
+            logger.error(f"ValueError creating ticket order: {error_msg}")
+            raise HTTPException(status_code=400, detail=error_msg)
+    except RuntimeError as e:
+        logger.error(f"RuntimeError creating ticket order: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error creating ticket order: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create ticket order")
+
+@app.get("/tickets/orders/{ticket_id}", response_model=ticket_schemas.TicketOrderStatus)
+async def read_ticket_order(ticket_id: str):
+    status = await ticket_repository.get_order_status(ticket_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Ticket order not found")
+    return status
+
+@app.get("/tickets/orders/{ticket_id}/events")
+async def stream_ticket_order(ticket_id: str):
+    if not await ticket_repository.get_order_status(ticket_id):
+        raise HTTPException(status_code=404, detail="Ticket order not found")
+
+    async def events():
+        async for status in ticket_repository.watch_order_status(ticket_id):
+            data = ticket_schemas.TicketOrderStatus(**status).model_dump_json()
+            yield f"event: status\ndata: {data}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8001)
\ No newline at end of file
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
 from src.repositories.concert_repository import concert_repository
 from src.dto import concert as concert_schemas
+from src.utils.concert_weights import concert_weights
 import logging
 
 router = APIRouter(prefix="/concerts", tags=["concerts"])
@@ -42,3 +43,13 @@ async def update_concert(concert_id: str, concert: concert_schemas.ConcertUpdate
         logger.error("Failed to update concert")
         raise HTTPException(status_code=500, detail="Failed to update concert")
     return updated_concert
+
+@router.put("/{concert_id}/weight", response_model=concert_schemas.ConcertWeight)
+async def update_concert_weight(concert_id: str, weight: concert_schemas.ConcertWeight, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    existing_concert = await concert_repository.get(concert_id)
+    if not existing_concert:
+        logger.error("Concert not found for weight update")
+        raise HTTPException(status_code=404, detail="Concert not found")
+    await concert_weights.aset(concert_id, weight.weight)
+    return weight
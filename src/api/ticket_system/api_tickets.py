@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
 from src.repositories.ticket_repository import ticket_repository
@@ -35,6 +36,46 @@ async def create_ticket(ticket: ticket_schemas.TicketCreate, db: Session = Depen
         logger.error(f"Unexpected error creating ticket: {e}")
         raise HTTPException(status_code=500, detail="Failed to create ticket")
 
+@router.post("/orders", response_model=ticket_schemas.TicketOrderStatus, status_code=202)
+async def create_ticket_order(ticket: ticket_schemas.TicketCreate, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    try:
+        ticket_id = await ticket_repository.create_async(ticket)
+        return ticket_schemas.TicketOrderStatus(ticket_id=ticket_id, status='pending')
+    except ValueError as e:
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            logger.error(error_msg)
+            raise HTTPException(status_code=404, detail=error_msg)
+        else:
+            logger.error(f"ValueError creating ticket order: {error_msg}")
+            raise HTTPException(status_code=400, detail=error_msg)
+    except RuntimeError as e:
+        logger.error(f"RuntimeError creating ticket order: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error creating ticket order: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create ticket order")
+
+@router.get("/orders/{ticket_id}", response_model=ticket_schemas.TicketOrderStatus)
+async def read_ticket_order(ticket_id: str):
+    status = await ticket_repository.get_order_status(ticket_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Ticket order not found")
+    return status
+
+@router.get("/orders/{ticket_id}/events")
+async def stream_ticket_order(ticket_id: str):
+    if not await ticket_repository.get_order_status(ticket_id):
+        raise HTTPException(status_code=404, detail="Ticket order not found")
+
+    async def events():
+        async for status in ticket_repository.watch_order_status(ticket_id):
+            data = ticket_schemas.TicketOrderStatus(**status).model_dump_json()
+            yield f"event: status\ndata: {data}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @router.get("/{ticket_id}", response_model=ticket_schemas.TicketDetail)
 async def read_ticket(ticket_id: str, db: Session = Depends(get_db)):
     db_session_context.set(db)
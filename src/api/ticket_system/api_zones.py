@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from src.utils.database import get_db, Base, engine, db_session_context
 from src.repositories.zone_repository import zone_repository
 from src.dto import zone as zone_schemas
-from src.utils.cache import invalidate_cache
+from src.utils.cache import ainvalidate_tag, concert_tag
 import logging
 
 router = APIRouter(prefix="/zones", tags=["zones"])
@@ -16,7 +16,7 @@ async def create_zone(zone: zone_schemas.ZoneCreate, db: Session = Depends(get_d
     db_session_context.set(db)
     try:
         result = await zone_repository.create(zone)
-        invalidate_cache(zone.concert_id)
+        await ainvalidate_tag(concert_tag(zone.concert_id))
         return result
     except ValueError as e:
         error_msg = str(e)
@@ -48,5 +48,17 @@ async def update_zone(zone_id: str, zone: zone_schemas.ZoneUpdate, db: Session =
     if not updated_zone:
         logger.error("Failed to update zone")
         raise HTTPException(status_code=500, detail="Failed to update zone")
-    invalidate_cache(updated_zone.concert_id)
+    await ainvalidate_tag(concert_tag(updated_zone.concert_id))
     return updated_zone
+
+@router.put("/{zone_id}/split", response_model=zone_schemas.ZoneSplit)
+async def split_zone(zone_id: str, split: zone_schemas.ZoneSplit, db: Session = Depends(get_db)):
+    db_session_context.set(db)
+    try:
+        zone = await zone_repository.split(zone_id, split.partitions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not zone:
+        logger.error("Zone not found for split")
+        raise HTTPException(status_code=404, detail="Zone not found")
+    return split
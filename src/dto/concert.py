@@ -1,4 +1,5 @@
 from datetime import datetime
+from pydantic import Field
 from src.dto import BaseSchema
 from src.dto.zone import Zone as ZoneSchema
 from src.dto.venue import Venue as VenueSchema
@@ -34,5 +35,8 @@ class Concert(BaseSchema):
     created_at: datetime
     updated_at: datetime
 
+class ConcertWeight(BaseSchema):
+    weight: float = Field(gt=0)
+
 class ConcertDetail(Concert):
     zones: list[ZoneSchema] = []
\ No newline at end of file
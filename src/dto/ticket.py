@@ -32,3 +32,9 @@ class TicketDetail(Ticket):
     price: float | None = None
     zone_name: str | None = None
     zone_description: str | None = None
+
+class TicketOrderStatus(BaseModel):
+    ticket_id: str
+    status: str
+    error: str | None = None
+    ticket: TicketDetail | None = None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from pydantic import Field
 
 from src.dto import BaseSchema
 
@@ -18,6 +19,9 @@ class ZoneUpdate(BaseSchema):
     description: str | None = None
     zone_number: int | None = None
 
+class ZoneSplit(BaseSchema):
+    partitions: int = Field(ge=1)
+
 class Zone(BaseSchema):
     id: str
     concert_id: str
@@ -2,37 +2,87 @@
 import asyncio
 import logging
 import time
-import json
 from typing import Dict, Any, Optional
-from aiokafka import AIOKafkaConsumer
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener
 from aiokafka.errors import KafkaError
 from src.utils.kafka_config import kafka_config
-from src.utils.cache import redis_client
+from src.utils.cache import (
+    async_redis_client, astore_cached, apublish_invalidation, invalidate_local, build_cache_key, concert_tag,
+    encode_cached, decode_cached, INSTANCE_ID
+)
+from src.dto.ticket import TicketDetail
+from src.utils.metadata import zone_metadata
+from src.utils.config import settings
+from src.kafka.results import ResultRegistry
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class ResultRebalanceListener(ConsumerRebalanceListener):
+    """
+    Keeps this instance's read positions across rebalances. Offsets are never committed, so without
+    this every rebalance (one per new concert topic) would reset all partitions to the latest offset
+    and skip results still in flight. Topics of concerts created after startup are read from the beginning.
+    """
+
+    def __init__(self, result_consumer: 'TicketResultConsumer'):
+        self.result_consumer = result_consumer
+        self.known_topics: set[str] | None = None
+        self.positions: dict = {}
+
+    async def on_partitions_revoked(self, revoked):
+        consumer = self.result_consumer.consumer
+        for tp in revoked:
+            try:
+                self.positions[tp] = await consumer.position(tp)
+            except Exception as e:
+                logger.warning(f"Could not read position of {tp}: {e}")
+
+    async def on_partitions_assigned(self, assigned):
+        consumer = self.result_consumer.consumer
+        topics = {tp.topic for tp in assigned}
+
+        for tp in assigned:
+            position = self.positions.pop(tp, None)
+            if position is not None:
+                consumer.seek(tp, position)
+
+        if self.known_topics is None:
+            # Existing topics start from the latest offset
+            self.known_topics = topics
+            return
+
+        new_partitions = [tp for tp in assigned if tp.topic not in self.known_topics]
+        if new_partitions:
+            await consumer.seek_to_beginning(*new_partitions)
+            logger.info(f"Reading {len(new_partitions)} partitions of new concert topics from the beginning")
+        self.known_topics |= topics
+
+
 class TicketResultConsumer:
     def __init__(self):
         self.consumer = None
-        self.pending_results: Dict[str, Dict[str, Any]] = {}
-        self.result_events: Dict[str, asyncio.Event] = {}
+        # Results are routed back to the instance that produced the order
+        self.instance_id = INSTANCE_ID
+        # Only results a local request is waiting on are kept
+        self.results = ResultRegistry(
+            maxsize=settings.RESULT_REGISTRY_MAX_SIZE,
+            ttl=settings.RESULT_REGISTRY_TTL
+        )
         self.running = False
 
     async def connect(self):
-        """Initialize Kafka consumer for ticket results"""
+        """Initialize Kafka consumer for the results of every concert, current and future"""
         try:
-            ticket_events_topic = kafka_config.get_ticket_events_topic()
-
-            if not ticket_events_topic:
-                logger.warning("Ticket events topic not found")
-                return
-
+            # Every instance is alone in its group, so it sees the results of all partitions
             self.consumer = kafka_config.create_consumer(
-                group_id='ticket-result-consumer',
-                topics=ticket_events_topic
+                group_id=f'ticket-result-consumer-{self.instance_id}',
+                pattern=kafka_config.get_ticket_events_pattern(),
+                listener=ResultRebalanceListener(self),
+                enable_auto_commit=False,
+                raw_values=True
             )
             await self.consumer.start()
             logger.info("Ticket result consumer connected")
@@ -51,22 +101,25 @@ class TicketResultConsumer:
         logger.info("Starting ticket result consumer...")
         self.running = True
 
+        # Results only reference their zone; details come from the local metadata cache
+        zone_metadata.listen_for_invalidations()
+
         try:
             async for message in self.consumer:
                 if not self.running:
                     break
 
                 try:
-                    result_data = message.value
+                    # Skip results for other instances before paying for decoding
+                    if not self.is_own_result(message.headers):
+                        continue
+
+                    result_data = kafka_config.codec.decode(message.value)
                     ticket_id = result_data.get('ticket_id')
 
                     if ticket_id:
-                        # Store the result
-                        self.pending_results[ticket_id] = result_data
-
-                        # Notify waiting coroutines
-                        if ticket_id in self.result_events:
-                            self.result_events[ticket_id].set()
+                        # Hand the result to the request waiting for it, if any
+                        self.results.resolve(ticket_id, result_data)
 
                         logger.info(
                             f"Received result for ticket {ticket_id}: {result_data.get('status')}")
@@ -82,68 +135,76 @@ class TicketResultConsumer:
         finally:
             await self.cleanup()
 
+    def is_own_result(self, headers) -> bool:
+        for key, value in headers or ():
+            if key == kafka_config.reply_to_header:
+                return value.decode('utf-8') == self.instance_id
+        # Results of orders sent before reply routing carry no header
+        return True
+
+    async def build_ticket_detail(self, result_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """TicketDetail fields of a successful result, rebuilt from the zone metadata it references"""
+        if result_data.get('ticket_data'):
+            # Cached results and results of processors from before slim events embed the details
+            ticket_data = result_data['ticket_data'].copy()
+            if 'ticket_id' in ticket_data:
+                ticket_data['id'] = ticket_data.pop('ticket_id')
+            ticket_data.pop('_cached_type', None)
+            return ticket_data
+
+        return await asyncio.to_thread(
+            zone_metadata.ticket_detail,
+            result_data['ticket_id'],
+            result_data['zone_id'],
+            result_data.get('created_at')
+        )
+
     async def cache_ticket_result(self, ticket_id: str, result_data: Dict[str, Any]):
         """Cache ticket result for future retrieval"""
         try:
-            if result_data.get('status') == 'success' and 'ticket_data' in result_data:
-                ticket_data = result_data['ticket_data'].copy()
-                if 'ticket_id' in ticket_data:
-                    ticket_data['id'] = ticket_data.pop('ticket_id')
-
-                ticket_data['_cached_type'] = 'TicketDetail'
-                serialized = json.dumps(ticket_data, default=str)
-                redis_client.setex(ticket_id, 3600, serialized)
+            ticket_data = None
+            if result_data.get('status') == 'success':
+                ticket_data = await self.build_ticket_detail(result_data)
+
+            if ticket_data:
+                # Written in the same format get_with_details caches, so either side can read the other's entries
+                encoded = encode_cached(TicketDetail.model_validate(ticket_data), cached_at=time.time())
+                cache_key = build_cache_key('ticket_detail', ticket_id)
+                # Storing the details also clears a "not found" cached while the order was in flight
+                if await astore_cached(cache_key, encoded, 3600, tags=[concert_tag(ticket_data['concert_id'])]):
+                    invalidate_local(cache_key)
+                    await apublish_invalidation([cache_key])
             else:
                 logger.info(f"Skipping cache for failed ticket result: {ticket_id}")
-             # Cache for 1 hour
         except Exception as e:
             logger.error(f"Failed to cache result for ticket {ticket_id}: {e}")
 
-    async def wait_for_ticket_result(self, ticket_id: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
-        """Wait for ticket processing result"""
-        # Check if result is already available
-        if ticket_id in self.pending_results:
-            result = self.pending_results.pop(ticket_id)
-            return result
-
-        # Check cache first
-        cached_result = await self.get_cached_result(ticket_id)
-        if cached_result:
-            return cached_result
+    def register_ticket(self, ticket_id: str):
+        """Start waiting for a ticket's result before its order is produced, so no result can be missed"""
+        self.results.register(ticket_id)
 
-        # Create event for this ticket
-        if ticket_id not in self.result_events:
-            self.result_events[ticket_id] = asyncio.Event()
-
-        event = self.result_events[ticket_id]
-
-        # Wait for result with timeout
-        try:
-            # Wait for result with timeout
-            await asyncio.wait_for(event.wait(), timeout=timeout)
+    def discard_ticket(self, ticket_id: str):
+        self.results.discard(ticket_id)
 
-            if ticket_id in self.pending_results:
-                result = self.pending_results.pop(ticket_id)
-                # Clean up the event
-                if ticket_id in self.result_events:
-                    del self.result_events[ticket_id]
-                return result
-
-        except asyncio.TimeoutError:
+    async def wait_for_ticket_result(self, ticket_id: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        """Wait for ticket processing result"""
+        # A ticket nobody registered for may already have a cached result
+        if not self.results.is_waiting(ticket_id):
+            cached_result = await self.get_cached_result(ticket_id)
+            if cached_result:
+                return {'ticket_id': ticket_id, 'status': 'success', 'ticket_data': cached_result}
+
+        result = await self.results.wait(ticket_id, timeout=timeout)
+        if result is None:
             logger.warning(f"Timeout waiting for result of ticket {ticket_id}")
-
-        # Clean up the event on timeout
-        if ticket_id in self.result_events:
-            del self.result_events[ticket_id]
-
-        return None
+        return result
 
     async def get_cached_result(self, ticket_id: str) -> Optional[Dict[str, Any]]:
         """Get cached ticket result"""
         try:
-            cached_data = redis_client.get(ticket_id)
+            cached_data = await async_redis_client.get(build_cache_key('ticket_detail', ticket_id))
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cached(cached_data, TicketDetail).model_dump(mode='json')
         except Exception as e:
             logger.error(f"Error getting cached result for ticket {ticket_id}: {e}")
         return None
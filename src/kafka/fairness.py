@@ -0,0 +1,72 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FairScheduler:
+    """Weighted fair queueing of processing slots between flows (concerts).
+    Each batch gets a virtual finish time of start + cost / weight and waiting batches are
+    granted in finish-time order, so a flooded concert cannot starve the others"""
+
+    def __init__(self, max_concurrency: int, default_weight: float = 1.0):
+        self.max_concurrency = max_concurrency
+        self.default_weight = default_weight
+        self.weights: Dict[str, float] = {}
+        self.in_flight = 0
+        self.virtual_time = 0.0
+        self.finish_times: Dict[str, float] = {}
+        self.waiters: List[Tuple[float, int, float, asyncio.Future]] = []
+        self.sequence = itertools.count()
+
+    def set_weights(self, weights: Dict[str, float]):
+        self.weights = weights
+        # Flows that are idle again have nothing left to catch up on
+        self.finish_times = {
+            flow: finish for flow, finish in self.finish_times.items() if finish > self.virtual_time
+        }
+
+    def weight(self, flow: str) -> float:
+        return max(self.weights.get(flow, self.default_weight), 0.01)
+
+    async def acquire(self, flow: str, cost: float = 1.0):
+        start = max(self.virtual_time, self.finish_times.get(flow, 0.0))
+        finish = start + cost / self.weight(flow)
+        self.finish_times[flow] = finish
+
+        if self.in_flight < self.max_concurrency and not self.waiters:
+            self.in_flight += 1
+            self.virtual_time = max(self.virtual_time, start)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (finish, next(self.sequence), start, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancellation: hand the slot on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        while self.waiters and self.in_flight < self.max_concurrency:
+            _, _, start, future = heapq.heappop(self.waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            self.virtual_time = max(self.virtual_time, start)
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, flow: str, cost: float = 1.0):
+        await self.acquire(flow, cost)
+        try:
+            yield
+        finally:
+            self.release()
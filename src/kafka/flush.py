@@ -0,0 +1,39 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FlushController:
+    """Decides when buffered tickets are written: on batch size, on age, or to meet a latency target"""
+
+    def __init__(self, max_batch_size: int, max_age: float, latency_target: float, smoothing: float = 0.2):
+        self.max_batch_size = max_batch_size
+        self.max_age = max_age
+        self.latency_target = latency_target
+        self.smoothing = smoothing
+        # Moving average of how long a flush takes, in seconds
+        self.flush_duration = 0.0
+
+    def deadline(self) -> float:
+        """Age of the oldest pending ticket at which a flush must start"""
+        return max(min(self.max_age, self.latency_target - self.flush_duration), 0.0)
+
+    def should_flush(self, pending_count: int, oldest_age: float) -> bool:
+        if pending_count == 0:
+            return False
+        if pending_count >= self.max_batch_size:
+            return True
+        return oldest_age >= self.deadline()
+
+    def time_until_flush(self, pending_count: int, oldest_age: float, idle_timeout: float = 1.0) -> float:
+        if pending_count == 0:
+            return idle_timeout
+        return max(self.deadline() - oldest_age, 0.0)
+
+    def record_flush(self, duration: float, batch_size: int):
+        if self.flush_duration == 0.0:
+            self.flush_duration = duration
+        else:
+            self.flush_duration += self.smoothing * (duration - self.flush_duration)
+        logger.info(f"Flushed {batch_size} tickets in {duration * 1000:.1f} ms "
+                    f"(average {self.flush_duration * 1000:.1f} ms)")
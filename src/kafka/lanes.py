@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, Any
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener, TopicPartition
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionLane:
+    """Sequential worker for a single TopicPartition, fed through a queue that is full at maxsize.
+    The queue itself never blocks the dispatcher; the partition is paused while it is full instead"""
+
+    def __init__(self, tp: TopicPartition, handler: Callable[[TopicPartition, Any], Awaitable[None]], maxsize: int):
+        self.tp = tp
+        self.handler = handler
+        self.maxsize = maxsize
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+    def full(self) -> bool:
+        return self.queue.qsize() >= self.maxsize
+
+    async def run(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self.handler(self.tp, item)
+            except Exception as e:
+                logger.error(f"Error in lane {self.tp.topic}[{self.tp.partition}]: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def stop(self, drain: bool = True):
+        """Stop the worker, by default after everything already queued has been handled"""
+        if drain:
+            await self.queue.join()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+
+class LaneScheduler:
+    """Runs one lane per assigned partition so independent zones are processed concurrently"""
+
+    def __init__(self, handler: Callable[[Any], Awaitable[None]], maxsize: int = 1000):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.consumer: AIOKafkaConsumer | None = None
+        self.lanes: Dict[TopicPartition, PartitionLane] = {}
+        # A partition stays paused while any reason (full lane, processor backpressure, ...) holds it
+        self.pause_reasons: Dict[TopicPartition, set[str]] = {}
+
+    def bind(self, consumer: AIOKafkaConsumer):
+        self.consumer = consumer
+
+    def pause(self, tp: TopicPartition, reason: str):
+        reasons = self.pause_reasons.setdefault(tp, set())
+        if reason in reasons:
+            return
+        reasons.add(reason)
+        if self.consumer and tp in self.consumer.assignment() and tp not in self.consumer.paused():
+            self.consumer.pause(tp)
+            logger.info(f"Paused {tp.topic}[{tp.partition}]: {reason}")
+
+    def resume(self, tp: TopicPartition, reason: str):
+        reasons = self.pause_reasons.get(tp)
+        if not reasons or reason not in reasons:
+            return
+        reasons.discard(reason)
+        if not reasons:
+            del self.pause_reasons[tp]
+            if self.consumer and tp in self.consumer.paused():
+                self.consumer.resume(tp)
+                logger.info(f"Resumed {tp.topic}[{tp.partition}]")
+
+    def assign(self, partitions: Iterable[TopicPartition]):
+        for tp in partitions:
+            if tp not in self.lanes:
+                self.lanes[tp] = PartitionLane(tp, self._handle, self.maxsize)
+                logger.info(f"Started lane for {tp.topic}[{tp.partition}]")
+
+    async def revoke(self, partitions: Iterable[TopicPartition]):
+        for tp in list(partitions):
+            lane = self.lanes.pop(tp, None)
+            self.pause_reasons.pop(tp, None)
+            if lane:
+                await lane.stop()
+                logger.info(f"Stopped lane for {tp.topic}[{tp.partition}]")
+
+    async def dispatch(self, tp: TopicPartition, item: Any):
+        """Queue work on the partition's lane without waiting, pausing the partition while its lane is full.
+        A full lane takes at most the records already fetched, so one hot partition never stalls the others"""
+        if tp not in self.lanes:
+            self.assign([tp])
+        lane = self.lanes[tp]
+
+        lane.queue.put_nowait(item)
+        if lane.full():
+            self.pause(tp, 'lane full')
+
+    async def _handle(self, tp: TopicPartition, item: Any):
+        try:
+            await self.handler(item)
+        finally:
+            self._maybe_resume(tp)
+
+    def _maybe_resume(self, tp: TopicPartition):
+        lane = self.lanes.get(tp)
+        if lane and lane.queue.qsize() <= self.maxsize // 2:
+            self.resume(tp, 'lane full')
+
+    async def stop(self):
+        await self.revoke(list(self.lanes.keys()))
+
+
+class LaneRebalanceListener(ConsumerRebalanceListener):
+    """Creates and tears down lanes as the consumer group rebalances"""
+
+    def __init__(self, scheduler: LaneScheduler):
+        self.scheduler = scheduler
+
+    async def on_partitions_revoked(self, revoked):
+        await self.scheduler.revoke(revoked)
+
+    async def on_partitions_assigned(self, assigned):
+        self.scheduler.assign(assigned)
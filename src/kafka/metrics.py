@@ -0,0 +1,25 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Every worker process writes its own samples; the supervisor aggregates them in multiprocess mode
+ORDERS_PROCESSED = Counter(
+    "ticket_processor_orders_total",
+    "Total count of ticket orders validated by result status.",
+    ["status"],
+)
+TICKETS_PERSISTED = Counter(
+    "ticket_processor_tickets_persisted_total",
+    "Total count of tickets written to the database.",
+)
+TICKETS_DEAD_LETTERED = Counter(
+    "ticket_processor_tickets_dead_lettered_total",
+    "Total count of tickets moved to the dead-letter topic.",
+)
+FLUSH_DURATION = Histogram(
+    "ticket_processor_flush_duration_seconds",
+    "Histogram of ticket flush time (in seconds)",
+)
+BUFFERED_TICKETS = Gauge(
+    "ticket_processor_buffered_tickets",
+    "Gauge of accepted tickets not yet durable, summed over live workers",
+    multiprocess_mode="livesum",
+)
@@ -0,0 +1,55 @@
+import logging
+from typing import Dict, Iterable
+from aiokafka import TopicPartition
+
+logger = logging.getLogger(__name__)
+
+
+class OffsetTracker:
+    """Tracks consumed offsets per partition until the work they carry is durable
+    and the result of their order has been delivered"""
+
+    def __init__(self):
+        self.outstanding: Dict[TopicPartition, set[int]] = {}
+        self.undelivered: Dict[TopicPartition, set[int]] = {}
+        self.next_offset: Dict[TopicPartition, int] = {}
+        self.committed: Dict[TopicPartition, int] = {}
+
+    def track(self, tp: TopicPartition, offsets: Iterable[int]):
+        offsets = list(offsets)
+        if not offsets:
+            return
+        self.outstanding.setdefault(tp, set()).update(offsets)
+        self.undelivered.setdefault(tp, set()).update(offsets)
+        self.next_offset[tp] = max(self.next_offset.get(tp, 0), max(offsets) + 1)
+
+    def complete(self, tp: TopicPartition, offsets: Iterable[int]):
+        pending = self.outstanding.get(tp)
+        if pending is not None:
+            pending.difference_update(offsets)
+
+    def deliver(self, tp: TopicPartition, offsets: Iterable[int]):
+        undelivered = self.undelivered.get(tp)
+        if undelivered is not None:
+            undelivered.difference_update(offsets)
+
+    def committable(self) -> Dict[TopicPartition, int]:
+        """Highest offset per partition below which everything is durable, delivered and not yet committed"""
+        offsets = {}
+        for tp, next_offset in self.next_offset.items():
+            pending = self.outstanding.get(tp, set()) | self.undelivered.get(tp, set())
+            offset = min(pending) if pending else next_offset
+            if offset > self.committed.get(tp, -1):
+                offsets[tp] = offset
+        return offsets
+
+    def mark_committed(self, offsets: Dict[TopicPartition, int]):
+        for tp, offset in offsets.items():
+            self.committed[tp] = max(self.committed.get(tp, -1), offset)
+
+    def forget(self, partitions: Iterable[TopicPartition]):
+        for tp in partitions:
+            self.outstanding.pop(tp, None)
+            self.undelivered.pop(tp, None)
+            self.next_offset.pop(tp, None)
+            self.committed.pop(tp, None)
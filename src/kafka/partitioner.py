@@ -0,0 +1,86 @@
+import abc
+import asyncio
+import logging
+import zlib
+from src.utils.cache import TTLCache, redis_client
+from src.utils.config import settings
+from src.utils.metadata import zone_metadata
+
+logger = logging.getLogger(__name__)
+
+
+class Partitioner(abc.ABC):
+    """Chooses the partition of a concert topic that a ticket order is sent to"""
+
+    def partition_count(self, num_zones: int) -> int:
+        return num_zones
+
+    @abc.abstractmethod
+    async def partition(self, zone_id: str, ticket_id: str, num_partitions: int) -> int:
+        ...
+
+
+class ZonePartitioner(Partitioner):
+    """Gives every zone a block of partitions by zone_number.
+    Orders of a zone go to the first partition of its block, unless an admin split the zone,
+    in which case they are spread by ticket id over the first N partitions of the block"""
+
+    def __init__(self, partitions_per_zone: int = 1, split_ttl: float = 5):
+        self.partitions_per_zone = partitions_per_zone
+        self.splits_key = 'zone-splits'
+        self.splits = TTLCache(maxsize=10000, ttl=split_ttl)
+
+    def partition_count(self, num_zones: int) -> int:
+        return num_zones * self.partitions_per_zone
+
+    def get_split(self, zone_id: str) -> int:
+        """Number of sub-partitions a zone is spread over, 1 when it is not split"""
+        split = self.splits.get(zone_id)
+        if split is None:
+            value = redis_client.hget(self.splits_key, zone_id)
+            split = min(max(int(value), 1), self.partitions_per_zone) if value else 1
+            self.splits.set(zone_id, split)
+        return split
+
+    def set_split(self, zone_id: str, split: int):
+        if split <= 1:
+            redis_client.hdel(self.splits_key, zone_id)
+        else:
+            redis_client.hset(self.splits_key, zone_id, split)
+        self.splits.set(zone_id, max(split, 1))
+        logger.info(f"Zone {zone_id} now spread over {split} partitions")
+
+    def has_zone_blocks(self, num_partitions: int, num_zones: int) -> bool:
+        """Topics created before zones had a block of partitions hold one partition per zone"""
+        return num_partitions >= self.partition_count(num_zones)
+
+    def sub_partition(self, partition: int, num_partitions: int, num_zones: int) -> int:
+        """Position of a partition within its zone's block, which is also its inventory share.
+        Always 0 on topics without zone blocks, where zones are never split"""
+        if not self.has_zone_blocks(num_partitions, num_zones):
+            return 0
+        return partition % self.partitions_per_zone
+
+    async def partition(self, zone_id: str, ticket_id: str, num_partitions: int) -> int:
+        metadata = zone_metadata.get_cached(zone_id)
+        if metadata is None:
+            metadata = await asyncio.to_thread(zone_metadata.get, zone_id)
+        if metadata is None:
+            raise ValueError(f"Zone {zone_id} not found")
+        zone_number = metadata['zone_number']
+
+        if not self.has_zone_blocks(num_partitions, metadata['num_zones']):
+            return (zone_number - 1) % num_partitions
+
+        split = self.splits.get(zone_id)
+        if split is None:
+            split = await asyncio.to_thread(self.get_split, zone_id)
+
+        sub = zlib.crc32(ticket_id.encode('utf-8')) % split if split > 1 else 0
+        return (zone_number - 1) * self.partitions_per_zone + sub
+
+
+zone_partitioner = ZonePartitioner(
+    partitions_per_zone=settings.PARTITIONS_PER_ZONE,
+    split_ttl=settings.ZONE_SPLIT_CACHE_TTL
+)
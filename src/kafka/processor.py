@@ -2,16 +2,26 @@ import asyncio
 import logging
 import logging_loki
 import time
-import json
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
-
-from src.repositories import zone_repository, concert_repository
-from src.utils.cache import update_cache
-from src.utils.database import db_session_context, SessionLocal
+from aiokafka import TopicPartition, ConsumerRecord
+from sqlalchemy import insert, update, case
+
+from src.utils.cache import update_cache, clear_missing, build_cache_key, concert_tag
+from src.utils.inventory import seat_inventory
+from src.utils.ticket_status import ticket_status
+from src.utils.metadata import zone_metadata, build_ticket_detail
+from src.utils.concert_weights import concert_weights
+from src.utils.database import SessionLocal
 from src.utils.kafka_config import kafka_config, TicketResultEvent
 from src.kafka.producer import ticket_producer
-from src.dto.ticket import TicketDetail
+from src.kafka.partitioner import zone_partitioner
+from src.kafka.lanes import LaneScheduler, LaneRebalanceListener
+from src.kafka.flush import FlushController
+from src.kafka.offsets import OffsetTracker
+from src.kafka.fairness import FairScheduler
+from src.kafka.metrics import ORDERS_PROCESSED, TICKETS_PERSISTED, TICKETS_DEAD_LETTERED, FLUSH_DURATION, BUFFERED_TICKETS
 from src.entities.ticket import Ticket
 from src.entities.zone import Zone
 from src.entities.concert import Concert
@@ -31,27 +41,71 @@ root_logger = logging.getLogger()
 root_logger.addHandler(loki_handler)
 
 
+class ProcessorRebalanceListener(LaneRebalanceListener):
+    def __init__(self, processor: 'TicketProcessor'):
+        super().__init__(processor.lane_scheduler)
+        self.processor = processor
+
+    async def on_partitions_revoked(self, revoked):
+        await super().on_partitions_revoked(revoked)
+        await self.processor.on_partitions_revoked(revoked)
+
+    async def on_partitions_assigned(self, assigned):
+        await super().on_partitions_assigned(assigned)
+        # Newly assigned partitions start paused while the processor is under backpressure
+        self.processor.update_backpressure()
+
+
 class TicketProcessor:
     def __init__(self):
         self.consumer = None
-        self.ticket_queue = asyncio.Queue()
+        # Bounded so accepted tickets cannot pile up in memory while the database is slow
+        self.ticket_queue = asyncio.Queue(maxsize=settings.TICKET_QUEUE_MAX_SIZE)
+        # Tickets accepted but not yet durable: queued, buffered, being flushed or waiting for a retry
+        self.buffered_tickets = 0
+        self.backpressure = False
+        self.retry_tasks: set[asyncio.Task] = set()
+        # Batches whose results are sent but not yet confirmed delivered
+        self.delivery_tasks: set[asyncio.Task] = set()
         self.batch_timeout = settings.BATCH_TIMEOUT
+        self.flush_controller = FlushController(
+            max_batch_size=settings.FLUSH_MAX_BATCH_SIZE,
+            max_age=settings.BATCH_TIMEOUT,
+            latency_target=settings.FLUSH_LATENCY_TARGET_MS / 1000
+        )
+        # Flushes run on their own threads so commits never block consumption
+        self.persist_executor = ThreadPoolExecutor(
+            max_workers=settings.PERSIST_MAX_IN_FLIGHT,
+            thread_name_prefix='ticket-persist'
+        )
+        self.flush_slots = asyncio.Semaphore(settings.PERSIST_MAX_IN_FLIGHT)
+        self.flush_tasks: set[asyncio.Task] = set()
         self.running = False
+        # Stopped separately, only after the lanes have pushed their last accepted tickets
+        self.batch_running = False
         self.batch_task = None
+        self.lane_scheduler = LaneScheduler(self.handle_batch, maxsize=settings.LANE_QUEUE_SIZE)
+        # Lanes of all concerts share a few processing slots, handed out by concert weight
+        self.fair_scheduler = FairScheduler(max_concurrency=settings.FAIR_MAX_CONCURRENCY)
+        self.weights_task = None
+        # With manual commits an offset is only committed once its ticket is in the database
+        self.manual_commit = settings.PROCESSOR_MANUAL_COMMIT
+        self.offset_tracker = OffsetTracker()
+        # Lanes, the batch processor and revocations all commit; one at a time so offsets never move back
+        self.commit_lock = asyncio.Lock()
 
     async def connect(self):
-        """Initialize Kafka consumer"""
+        """Initialize Kafka consumer for every concert order topic, current and future"""
         try:
-            ticket_orders_topic = kafka_config.get_ticket_orders_topic()
-            logger.info(ticket_orders_topic)
-            if not ticket_orders_topic:
-                logger.warning("Concert order topic not found")
-                return
-
             self.consumer = kafka_config.create_consumer(
                 group_id='ticket-processor',
-                topics=ticket_orders_topic
+                pattern=kafka_config.get_ticket_orders_pattern(),
+                listener=ProcessorRebalanceListener(self),
+                enable_auto_commit=not self.manual_commit,
+                # Topics of new concerts are read from the start so no early order is skipped
+                auto_offset_reset='earliest'
             )
+            self.lane_scheduler.bind(self.consumer)
             await self.consumer.start()
             logger.info("Ticket processor consumer connected")
         except Exception as e:
@@ -59,159 +113,317 @@ class TicketProcessor:
             self.consumer = None
 
     async def start_batch_processor(self):
-        """Background task to handle batch processing from queue"""
+        """Background task that buffers accepted tickets and flushes them on size, age or latency target"""
         pending_tickets = []
-        last_batch_time = time.time()
+        oldest_ticket_time = 0.0
 
-        while self.running:
+        while self.batch_running:
+            oldest_age = time.monotonic() - oldest_ticket_time if pending_tickets else 0.0
             try:
-                # Wait for items with timeout
+                # Wait for items until the next flush is due
                 ticket_info = await asyncio.wait_for(
                     self.ticket_queue.get(),
-                    timeout=1.0
+                    timeout=self.flush_controller.time_until_flush(len(pending_tickets), oldest_age)
                 )
+                if not pending_tickets:
+                    oldest_ticket_time = time.monotonic()
                 pending_tickets.append(ticket_info)
                 self.ticket_queue.task_done()
 
-                current_time = time.time()
-
-                # Process batch only if timeout reached AND we have tickets
-                # Remove the queue.empty() check to allow accumulation
-                if current_time - last_batch_time >= self.batch_timeout:
-                    if pending_tickets:
-                        await self.batch_persist_tickets(pending_tickets)
-                        pending_tickets.clear()
-                        last_batch_time = current_time
+                # Drain whatever is already queued without waiting again
+                while len(pending_tickets) < self.flush_controller.max_batch_size and not self.ticket_queue.empty():
+                    pending_tickets.append(self.ticket_queue.get_nowait())
+                    self.ticket_queue.task_done()
 
             except asyncio.TimeoutError:
-                # Check if we should process pending tickets due to timeout
-                current_time = time.time()
-                if (pending_tickets and
-                        current_time - last_batch_time >= self.batch_timeout):
-                    await self.batch_persist_tickets(pending_tickets)
-                    pending_tickets.clear()
-                    last_batch_time = current_time
+                # Checkpoint partitions whose orders were all rejected and so never reach a flush
+                await self.commit_offsets()
             except Exception as e:
                 logger.error(f"Error in batch processor: {e}")
 
+            oldest_age = time.monotonic() - oldest_ticket_time if pending_tickets else 0.0
+            if self.flush_controller.should_flush(len(pending_tickets), oldest_age):
+                await self.schedule_flush(pending_tickets)
+                pending_tickets = []
+
         # Process any remaining tickets when shutting down
+        while not self.ticket_queue.empty():
+            pending_tickets.append(self.ticket_queue.get_nowait())
+            self.ticket_queue.task_done()
         if pending_tickets:
-            await self.batch_persist_tickets(pending_tickets)
+            await self.schedule_flush(pending_tickets)
+        if self.flush_tasks:
+            await asyncio.gather(*self.flush_tasks, return_exceptions=True)
+
+    async def schedule_flush(self, tickets_to_persist: List[Dict[str, Any]]):
+        """Start a flush in the background, waiting only while the in-flight cap is reached"""
+        await self.flush_slots.acquire()
+        task = asyncio.create_task(self.flush_tickets(tickets_to_persist))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        self.flush_tasks.discard(task)
+        self.flush_slots.release()
+
+    async def flush_tickets(self, tickets_to_persist: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        if await self.batch_persist_tickets(tickets_to_persist):
+            duration = time.perf_counter() - started
+            self.flush_controller.record_flush(duration, len(tickets_to_persist))
+            FLUSH_DURATION.observe(duration)
+        else:
+            task = asyncio.create_task(self.retry_tickets(tickets_to_persist))
+            self.retry_tasks.add(task)
+            task.add_done_callback(self.retry_tasks.discard)
+
+    async def retry_tickets(self, tickets_to_persist: List[Dict[str, Any]]):
+        """Retry a failed batch with exponential backoff, then hand it to the dead-letter topic"""
+        for attempt in range(1, settings.FLUSH_MAX_RETRIES + 1):
+            delay = min(settings.FLUSH_RETRY_BACKOFF_MS * 2 ** (attempt - 1), settings.FLUSH_RETRY_MAX_BACKOFF_MS) / 1000
+            logger.warning(f"Retrying {len(tickets_to_persist)} tickets in {delay:.1f}s "
+                           f"(attempt {attempt}/{settings.FLUSH_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+            async with self.flush_slots:
+                if await self.batch_persist_tickets(tickets_to_persist):
+                    return
+
+        while not await self.dead_letter_tickets(tickets_to_persist):
+            await asyncio.sleep(settings.FLUSH_RETRY_MAX_BACKOFF_MS / 1000)
+
+    async def dead_letter_tickets(self, tickets_to_persist: List[Dict[str, Any]]) -> bool:
+        entries = [{
+            'ticket_id': ticket_info['ticket_id'],
+            'zone_id': ticket_info['zone_id'],
+            'order_data': ticket_info['order_data'],
+            'ticket_data': ticket_info['ticket_data'],
+            'failed_at': time.time()
+        } for ticket_info in tickets_to_persist]
+
+        if not await ticket_producer.produce_dead_letters(entries):
+            return False
+
+        logger.error(f"Moved {len(entries)} tickets to the dead-letter topic after {settings.FLUSH_MAX_RETRIES} retries")
+        TICKETS_DEAD_LETTERED.inc(len(entries))
+        # The tickets are durable in the dead-letter topic, so their offsets are done
+        await self.release_tickets(tickets_to_persist)
+        return True
+
+    async def release_tickets(self, tickets: List[Dict[str, Any]]):
+        """Mark tickets as durable: complete their offsets, commit and ease backpressure"""
+        for ticket_info in tickets:
+            self.offset_tracker.complete(ticket_info['tp'], [ticket_info['offset']])
+        self.buffered_tickets -= len(tickets)
+        BUFFERED_TICKETS.set(self.buffered_tickets)
+        self.update_backpressure()
+        await self.commit_offsets()
+
+    def update_backpressure(self):
+        """Pause every assigned partition above the high watermark and resume below the low one"""
+        if not self.backpressure and self.buffered_tickets >= settings.TICKET_QUEUE_HIGH_WATERMARK:
+            self.backpressure = True
+            logger.warning(f"{self.buffered_tickets} tickets waiting for the database, pausing consumption")
+        elif self.backpressure and self.buffered_tickets <= settings.TICKET_QUEUE_LOW_WATERMARK:
+            self.backpressure = False
+            logger.info(f"{self.buffered_tickets} tickets waiting for the database, resuming consumption")
 
+        if not self.consumer:
+            return
+        for tp in self.consumer.assignment():
+            if self.backpressure:
+                self.lane_scheduler.pause(tp, 'backpressure')
+            else:
+                self.lane_scheduler.resume(tp, 'backpressure')
+
+    def seed_zone_inventory(self, zone_id: str) -> bool:
+        """Seed the Redis seat counter of a zone from zones.available_seats"""
+        db = SessionLocal()
+        try:
+            available_seats = db.query(Zone.available_seats).filter(Zone.id == zone_id).scalar()
+        finally:
+            db.close()
 
-    async def validate_ticket_order(self, order_data: Dict[str, Any], offset: int) -> TicketResultEvent:
-        """Validate ticket order and check availability"""
-        ticket_id = order_data.get('ticket_id')
-        zone_id = order_data.get('zone_id')
-        concert_id = order_data.get('concert_id')
+        if available_seats is None:
+            return False
+        seat_inventory.seed(zone_id, available_seats)
+        return True
+
+    def reserve_seats(self, zone_id: str, ticket_ids: List[str], partition: int,
+                      num_partitions: int) -> Tuple[Dict[str, Any], int, set[str]]:
+        """Look up zone metadata and reserve one seat per ticket id from the partition's share; runs off the event loop"""
+        # Static zone and concert fields come from the in-process metadata cache
+        metadata = zone_metadata.get(zone_id)
+        if not metadata:
+            raise ValueError(f"Zone {zone_id} not found")
+
+        # A split hot zone keeps one inventory share per sub-partition
+        share = zone_partitioner.sub_partition(partition, num_partitions, metadata['num_zones'])
+
+        # Atomically take up to one seat per order; seed the counter from the database on first use
+        granted = seat_inventory.reserve(zone_id, ticket_ids, share)
+        if granted is None:
+            if not self.seed_zone_inventory(zone_id):
+                raise ValueError(f"Zone {zone_id} not found")
+            granted = seat_inventory.reserve(zone_id, ticket_ids, share)
+        return metadata, share, set(granted or [])
+
+    async def validate_zone_batch(self, zone_id: str, messages: List[ConsumerRecord]) -> List[TicketResultEvent]:
+        """Validate a batch of orders for one zone with a single inventory reservation.
+        Returns one result per message, in the same order"""
+        results = []
+        granted = set()
+        accepted = set()
+        share = 0
 
         try:
-            db = SessionLocal()
-            db_session_context.set(db)
-
-            # Check if zone exists and has available seats
-            zone = await zone_repository.get(zone_id)
+            ticket_ids = [message.value.get('ticket_id') for message in messages]
+            partition = messages[0].partition
+            # Assigned topics always have metadata; without it the topic is treated as having no zone blocks
+            num_partitions = len(self.consumer.partitions_for_topic(messages[0].topic) or ()) or partition + 1
+            metadata, share, granted = await asyncio.to_thread(
+                self.reserve_seats, zone_id, ticket_ids, partition, num_partitions
+            )
 
-            # Get concert details
-            concert = await concert_repository.get(zone.concert_id)
+            now = datetime.now().isoformat()
+            for message in messages:
+                order_data = message.value
+                ticket_id = order_data.get('ticket_id')
+
+                if ticket_id not in granted:
+                    results.append(TicketResultEvent(
+                        ticket_id=ticket_id,
+                        zone_id=zone_id,
+                        concert_id=order_data.get('concert_id'),
+                        status='failed',
+                        error='No available seats in this zone',
+                        reply_to=order_data.get('reply_to')
+                    ))
+                    continue
+
+                # Full ticket details are kept for the dead-letter topic only
+                ticket_data = build_ticket_detail(ticket_id, metadata, now)
+
+                # Add to queue for batch processing; the offset is committed once the ticket is persisted
+                ticket_info = {
+                    'ticket_id': ticket_id,
+                    'zone_id': zone_id,
+                    'tp': TopicPartition(message.topic, message.partition),
+                    'offset': message.offset,
+                    'order_data': order_data,
+                    'ticket_data': ticket_data,
+                    'processed_at': time.time()
+                }
+                await self.ticket_queue.put(ticket_info)
+                self.buffered_tickets += 1
+                accepted.add(ticket_id)
 
-            if offset > zone.zone_capacity:
-                return TicketResultEvent(
+                results.append(TicketResultEvent(
                     ticket_id=ticket_id,
                     zone_id=zone_id,
-                    concert_id=concert_id,
-                    status='failed',
-                    error='No available seats in this zone'
-                )
-
-            # Create ticket data for validation
-            ticket_data = {
-                'id': ticket_id,
-                'zone_id': zone_id,
-                'concert_id': concert_id,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
-                'concert_name': concert.name if concert else None,
-                'concert_description': concert.description if concert else None,
-                'price': float(zone.price),
-                'zone_name': zone.name,
-                'zone_description': zone.description
-            }
-
-            # Add to queue for batch processing - thread-safe
-            ticket_info = {
-                'ticket_id': ticket_id,
-                'zone_id': zone_id,
-                'order_data': order_data,
-                'ticket_data': ticket_data,
-                'processed_at': time.time()
-            }
-            await self.ticket_queue.put(ticket_info)
-
-            zone.available_seats -= 1
-            update_cache(zone_id, zone)
-
-            logger.info(f"Ticket {ticket_id} validated successfully")
-            return TicketResultEvent(
-                ticket_id=ticket_id,
-                zone_id=zone_id,
-                concert_id=zone.concert_id,
-                status='success',
-                message='Ticket validated and reserved',
-                ticket_data=ticket_data
-            )
+                    concert_id=metadata['concert_id'],
+                    status='success',
+                    message='Ticket validated and reserved',
+                    created_at=now,
+                    reply_to=order_data.get('reply_to')
+                ))
+
+            logger.info(f"Validated {len(messages)} orders for zone {zone_id}: {len(accepted)} reserved")
+            BUFFERED_TICKETS.set(self.buffered_tickets)
+            self.update_backpressure()
+            return results
 
         except Exception as e:
-            logger.error(f"Error validating ticket {ticket_id}: {e}")
-            return TicketResultEvent(
-                ticket_id=ticket_id,
-                status='failed',
-                error=str(e)
-            )
-        finally:
-            db.close()
+            logger.error(f"Error validating orders for zone {zone_id}: {e}")
+            # Give back seats that were taken but never queued for persistence
+            unsold = list(granted - accepted)
+            if unsold:
+                await asyncio.to_thread(seat_inventory.release, zone_id, unsold, share)
+
+            for message in messages[len(results):]:
+                results.append(TicketResultEvent(
+                    ticket_id=message.value.get('ticket_id'),
+                    zone_id=zone_id,
+                    concert_id=message.value.get('concert_id'),
+                    status='failed',
+                    error=str(e),
+                    reply_to=message.value.get('reply_to')
+                ))
+            return results
 
-    async def batch_persist_tickets(self, tickets_to_persist: List[Dict[str, Any]]):
-        """Persist a batch of tickets to database"""
+    async def batch_persist_tickets(self, tickets_to_persist: List[Dict[str, Any]]) -> bool:
+        """Persist a batch of tickets to database on the persistence executor"""
         logger.info(f"batch_persist_tickets called with {len(tickets_to_persist)} tickets")
 
         if not tickets_to_persist:
             logger.info("No tickets to persist")
-            return
+            return True
 
         try:
-            db = SessionLocal()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.persist_executor, self.persist_tickets, tickets_to_persist)
+        except Exception as e:
+            logger.error(f"Error batch persisting tickets: {e}")
+            return False
+
+        # The batch is durable, so its offsets can be committed
+        await self.release_tickets(tickets_to_persist)
+        return True
 
-            # Batch insert tickets
+    def persist_tickets(self, tickets_to_persist: List[Dict[str, Any]]):
+        """Write tickets and seat decrements in one transaction; blocking, runs on a persistence thread"""
+        db = SessionLocal()
+        try:
+            now = datetime.now()
             zone_ticket_counts = {}
-            ticket_objects = []
+            ticket_rows = []
 
-            for ticket_info in tickets_to_persist:
-                ticket_obj = Ticket(
-                    id=ticket_info['ticket_id'],
-                    zone_id=ticket_info['zone_id']
-                )
-                ticket_objects.append(ticket_obj)
+            # Replayed orders may already be persisted; skip them so seats are not decremented twice
+            ticket_ids = [ticket_info['ticket_id'] for ticket_info in tickets_to_persist]
+            existing_ids = {
+                ticket_id for (ticket_id,) in db.query(Ticket.id).filter(Ticket.id.in_(ticket_ids))
+            }
 
+            for ticket_info in tickets_to_persist:
+                if ticket_info['ticket_id'] in existing_ids:
+                    continue
+                existing_ids.add(ticket_info['ticket_id'])
                 zone_id = ticket_info['zone_id']
+                ticket_rows.append({
+                    'id': ticket_info['ticket_id'],
+                    'zone_id': zone_id,
+                    'created_at': now,
+                    'updated_at': now
+                })
                 zone_ticket_counts[zone_id] = zone_ticket_counts.get(zone_id, 0) + 1
 
-            db.add_all(ticket_objects)
+            if not ticket_rows:
+                logger.info(f"All {len(tickets_to_persist)} tickets were already persisted")
+                return
 
-            for zone_id, ticket_count in zone_ticket_counts.items():
-                zone = db.query(Zone).filter(Zone.id == zone_id).first()
-                if zone:
-                    zone.available_seats -= ticket_count
-                    logger.info(f"Decreased {ticket_count} seats for zone {zone_id}")
+            # One multi-row INSERT for all tickets
+            db.execute(insert(Ticket).values(ticket_rows).prefix_with('IGNORE', dialect='mysql'))
+
+            # One UPDATE ... CASE for every affected zone
+            db.execute(
+                update(Zone)
+                .where(Zone.id.in_(list(zone_ticket_counts)))
+                .values(available_seats=Zone.available_seats - case(zone_ticket_counts, value=Zone.id))
+                .execution_options(synchronize_session=False)
+            )
 
             db.commit()
-            logger.info(f"Batch persisted {len(ticket_objects)} tickets to database")
+            TICKETS_PERSISTED.inc(len(ticket_rows))
+            logger.info(f"Batch persisted {len(ticket_rows)} tickets across {len(zone_ticket_counts)} zones")
 
-        except Exception as e:
-            logger.error(f"Error batch persisting tickets: {e}")
-            # Re-queue failed tickets for retry
-            for ticket_info in tickets_to_persist:
-                await self.ticket_queue.put(ticket_info)
+            # Lookups of these tickets made before they were persisted must not keep missing
+            clear_missing([build_cache_key('ticket', row['id']) for row in ticket_rows])
+
+            try:
+                # Keep the cached zone rows in line with the persisted seat counts
+                for zone in db.query(Zone).filter(Zone.id.in_(list(zone_ticket_counts))).all():
+                    update_cache(build_cache_key('zone', zone.id), zone, tags=[concert_tag(zone.concert_id)])
+            except Exception as e:
+                logger.error(f"Error refreshing cached zones: {e}")
         finally:
             db.close()
 
@@ -226,46 +438,150 @@ class TicketProcessor:
         logger.info("Starting ticket processor...")
         self.running = True
 
+        zone_metadata.listen_for_invalidations()
+
         # Start the background batch processor
+        self.batch_running = True
         self.batch_task = asyncio.create_task(self.start_batch_processor())
+        self.weights_task = asyncio.create_task(self.refresh_concert_weights())
 
         try:
-            async for message in self.consumer:
-                try:
-                    order_data = message.value
-                    logger.info(f"Processing ticket order: {order_data.get('ticket_id')} with offset {message.offset}")
-
-                    # Validate ticket order
-                    result = await self.validate_ticket_order(order_data, message.offset)
-
-                    # Produce result to ticket-events topic
-                    await ticket_producer.produce_ticket_result(result)
-
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+            while self.running:
+                batches = await self.consumer.getmany(
+                    timeout_ms=settings.PROCESSOR_BATCH_MAX_WAIT_MS,
+                    max_records=settings.PROCESSOR_BATCH_SIZE
+                )
+                for tp, messages in batches.items():
+                    self.offset_tracker.track(tp, (message.offset for message in messages))
+                    await self.lane_scheduler.dispatch(tp, messages)
 
         except Exception as e:
             logger.error(f"Error in message processing: {e}")
         finally:
             await self.cleanup()
 
+    async def refresh_concert_weights(self):
+        """Reload the admin-set concert weights used by the fair scheduler"""
+        while self.running:
+            try:
+                weights = await asyncio.to_thread(concert_weights.get_all)
+                self.fair_scheduler.set_weights(weights)
+            except Exception as e:
+                logger.error(f"Failed to refresh concert weights: {e}")
+            await asyncio.sleep(settings.FAIR_WEIGHT_REFRESH_SECONDS)
+
+    async def handle_batch(self, messages: List[ConsumerRecord]):
+        """Process a partition's batch once the fair scheduler grants its concert a slot"""
+        concert_id = kafka_config.get_concert_id_from_topic(messages[0].topic)
+        async with self.fair_scheduler.slot(concert_id, cost=len(messages)):
+            await self.process_batch(messages)
+
+    async def process_batch(self, messages: List[ConsumerRecord]):
+        """Validate a partition's batch zone by zone and publish all results"""
+        tp = TopicPartition(messages[0].topic, messages[0].partition)
+        zone_messages: Dict[str, List[ConsumerRecord]] = {}
+        for message in messages:
+            zone_messages.setdefault(message.value.get('zone_id'), []).append(message)
+
+        logger.info(f"Processing {len(messages)} ticket orders up to offset {messages[-1].offset}")
+
+        results = []
+        failed_offsets = []
+        for zone_id, zone_batch in zone_messages.items():
+            zone_results = await self.validate_zone_batch(zone_id, zone_batch)
+            results.extend(zone_results)
+            failed_offsets.extend(
+                message.offset for message, result in zip(zone_batch, zone_results) if result.status != 'success'
+            )
+
+        for result in results:
+            ORDERS_PROCESSED.labels(status=result.status).inc()
+
+        # Produce results to ticket-events topic; in pipelined mode delivery is confirmed in the background
+        delivery = await ticket_producer.send_ticket_results(results, partition=tp.partition)
+
+        # Clients of asynchronous orders poll the status instead of waiting for the event
+        try:
+            await asyncio.to_thread(ticket_status.set_results, [result.to_dict() for result in results])
+        except Exception as e:
+            logger.error(f"Failed to record ticket statuses: {e}")
+
+        task = asyncio.create_task(self.confirm_delivery(tp, messages, failed_offsets, delivery))
+        self.delivery_tasks.add(task)
+        task.add_done_callback(self.delivery_tasks.discard)
+
+    async def confirm_delivery(self, tp: TopicPartition, messages: List[ConsumerRecord],
+                               failed_offsets: List[int], delivery: asyncio.Future):
+        """Release a batch's offsets once its results are delivered, otherwise replay the batch"""
+        if await delivery:
+            # Rejected orders leave nothing to persist, so their offsets are done once the result is out
+            self.offset_tracker.complete(tp, failed_offsets)
+            self.offset_tracker.deliver(tp, (message.offset for message in messages))
+            return
+
+        # Replayed orders are reserved and persisted idempotently, so only the results are sent again
+        logger.error(f"Results for {tp.topic}[{tp.partition}] offsets {messages[0].offset}-{messages[-1].offset} "
+                     f"were not delivered, replaying the batch")
+        if self.consumer and tp in self.consumer.assignment():
+            self.consumer.seek(tp, messages[0].offset)
+
+    async def commit_offsets(self):
+        """Commit, per assigned partition, every offset whose tickets have been flushed"""
+        if not self.manual_commit or not self.consumer:
+            return
+
+        async with self.commit_lock:
+            assignment = self.consumer.assignment()
+            offsets = {tp: offset for tp, offset in self.offset_tracker.committable().items() if tp in assignment}
+            if not offsets:
+                return
+
+            try:
+                await self.consumer.commit(offsets)
+                self.offset_tracker.mark_committed(offsets)
+                logger.info(f"Committed offsets for {len(offsets)} partitions")
+            except Exception as e:
+                logger.error(f"Failed to commit offsets: {e}")
+
+    async def on_partitions_revoked(self, revoked):
+        """Checkpoint what is durable before another consumer takes the partitions over"""
+        await self.commit_offsets()
+        self.offset_tracker.forget(revoked)
+
     async def cleanup(self):
         """Clean up resources"""
         self.running = False
 
+        if self.weights_task:
+            self.weights_task.cancel()
+
+        # Let every lane finish the orders it already accepted
+        await self.lane_scheduler.stop()
+
+        # Only now can the batch processor flush what is left and wait for in-flight flushes
+        self.batch_running = False
+        if self.batch_task:
+            await self.batch_task
+            self.batch_task = None
+
+        # Batches still waiting for a retry are not committed and will be replayed after restart
+        for task in list(self.retry_tasks):
+            task.cancel()
+        if self.retry_tasks:
+            await asyncio.gather(*self.retry_tasks, return_exceptions=True)
+
+        self.persist_executor.shutdown(wait=True)
+
+        # Results of the last batches may still be waiting for delivery
+        await ticket_producer.close()
+        if self.delivery_tasks:
+            await asyncio.gather(*self.delivery_tasks, return_exceptions=True)
+        await self.commit_offsets()
+
         if self.consumer:
             await self.consumer.stop()
             logger.info("Consumer closed")
 
-        # Wait for queue to be processed
-        if self.batch_task:
-            await self.ticket_queue.join()  # Wait for all items to be processed
-            self.batch_task.cancel()
-            try:
-                await self.batch_task
-            except asyncio.CancelledError:
-                pass
-
 
 # Global processor instance
 ticket_processor = TicketProcessor()
@@ -1,23 +1,37 @@
 import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from aiokafka import AIOKafkaProducer
 from aiokafka.errors import KafkaError
 from src.utils.kafka_config import kafka_config, TicketOrderEvent, TicketResultEvent
+from src.utils.config import settings
+from src.kafka.partitioner import Partitioner, zone_partitioner
 
 logger = logging.getLogger(__name__)
 
 
 class TicketKafkaProducer:
-    def __init__(self):
+    def __init__(self, partitioner: Partitioner = zone_partitioner):
         self.producer = None
+        self.partitioner = partitioner
         # self.connect()
+        # In pipelined mode sends are not awaited; their delivery is checked by a background reporter
+        self.pipelined = settings.PRODUCER_PIPELINED
+        self.in_flight: List[Tuple[asyncio.Future, Dict[str, Any]]] = []
+        self.deliveries_pending = asyncio.Event()
+        # Records sent but not yet reported as delivered or given up on
+        self.outstanding = 0
+        self.all_reported = asyncio.Event()
+        self.all_reported.set()
+        self.reporter_task = None
 
     async def connect(self):
         """Initialize Kafka producer connection"""
         try:
             self.producer = kafka_config.create_producer()
             await self.producer.start()
+            if self.pipelined:
+                self.reporter_task = asyncio.create_task(self.report_deliveries())
             logger.info("AIOKafka producer connected successfully")
         except Exception as e:
             logger.error(f"Failed to connect to Kafka: {e}")
@@ -33,13 +47,15 @@ class TicketKafkaProducer:
 
         try:
             topic = kafka_config.get_concert_order_topic(ticket_order.concert_id)
+            partitions = await self.producer.partitions_for(topic)
+            partition = await self.partitioner.partition(ticket_order.zone_id, ticket_order.ticket_id, len(partitions))
 
             # Send the message
             record_metadata = await self.producer.send_and_wait(
                 topic,
                 key=ticket_order.zone_id,
                 value=ticket_order.to_dict(),
-                partition=int(ticket_order.zone_id[-1]) - 1
+                partition=partition
             )
 
             # Wait for the message to be sent
@@ -57,41 +73,184 @@ class TicketKafkaProducer:
             logger.error(f"Unexpected error sending ticket order: {e}")
             return False
 
+    async def send_pipelined(self, record: Dict[str, Any]):
+        """Hand a record to the producer's batch without waiting for the broker"""
+        future = await self.producer.send(
+            record['topic'],
+            key=record['key'],
+            value=record['value'],
+            partition=record['partition'],
+            headers=record['headers']
+        )
+        self.in_flight.append((future, record))
+        self.outstanding += 1
+        self.all_reported.clear()
+        self.deliveries_pending.set()
+
+    async def report_deliveries(self):
+        """Check delivery reports in batches off the hot path, resending failed records"""
+        while True:
+            if not self.in_flight:
+                self.deliveries_pending.clear()
+                await self.deliveries_pending.wait()
+                continue
+
+            batch, self.in_flight = self.in_flight, []
+            outcomes = await asyncio.gather(*(future for future, _ in batch), return_exceptions=True)
+
+            failed = 0
+            for (_, record), outcome in zip(batch, outcomes):
+                if not isinstance(outcome, Exception):
+                    self.settle(record, True)
+                    continue
+                failed += 1
+                if record['attempt'] < settings.PRODUCER_DELIVERY_RETRIES:
+                    record['attempt'] += 1
+                    try:
+                        await self.send_pipelined(record)
+                    except Exception as e:
+                        logger.error(f"Failed to resend record to {record['topic']}: {e}")
+                        self.settle(record, False)
+                else:
+                    logger.error(f"Giving up on record for {record['topic']} after "
+                                 f"{record['attempt']} retries: {outcome}")
+                    self.settle(record, False)
+
+            self.outstanding -= len(batch)
+            if not self.outstanding:
+                self.all_reported.set()
+
+            if failed:
+                logger.warning(f"{failed} of {len(batch)} records failed delivery")
+            else:
+                logger.info(f"Delivered {len(batch)} records")
+
+    @staticmethod
+    def settle(record: Dict[str, Any], delivered: bool):
+        """Report the final outcome of a pipelined record to whoever waits for its delivery"""
+        if not record['delivered'].done():
+            record['delivered'].set_result(delivered)
+
+    @staticmethod
+    def settled(delivered: bool) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(delivered)
+        return future
+
+    async def all_delivered(self, records: List[Dict[str, Any]]) -> bool:
+        outcomes = await asyncio.gather(*(record['delivered'] for record in records))
+        return all(outcomes)
+
+    async def flush(self):
+        """Wait until every pipelined record has been delivered or given up on"""
+        if self.reporter_task:
+            await self.all_reported.wait()
+
+    def reply_headers(self, ticket_result: TicketResultEvent) -> List[Tuple[str, bytes]] | None:
+        if not ticket_result.reply_to:
+            return None
+        return [(kafka_config.reply_to_header, ticket_result.reply_to.encode('utf-8'))]
+
     async def produce_ticket_result(self, ticket_result: TicketResultEvent) -> bool:
         """Produce ticket result to ticket-events topic"""
+        return await self.produce_ticket_results([ticket_result])
+
+    async def produce_ticket_results(self, ticket_results: List[TicketResultEvent], partition: int = None) -> bool:
+        """Produce a batch of ticket results and wait until all of them are delivered"""
+        delivery = await self.send_ticket_results(ticket_results, partition=partition)
+        return await delivery
+
+    async def send_ticket_results(self, ticket_results: List[TicketResultEvent], partition: int = None) -> asyncio.Future:
+        """Produce a batch of ticket results, letting the producer fill Kafka batches before waiting.
+        Results go to the same partition number as their orders when it is given.
+        Returns a future resolving to whether every result was delivered; in pipelined mode it
+        resolves once the delivery reporter has seen the last of them"""
+        if not ticket_results:
+            return self.settled(True)
+
         if not self.producer:
             await self.connect()
             if not self.producer:
                 logger.error("Kafka producer not available")
-                return False
+                return self.settled(False)
 
         try:
-            topic = kafka_config.get_concert_events_topic(ticket_result.concert_id)
+            records = [{
+                'topic': kafka_config.get_concert_events_topic(ticket_result.concert_id),
+                'key': ticket_result.zone_id,
+                'value': ticket_result.to_dict(),
+                'partition': partition,
+                'headers': self.reply_headers(ticket_result),
+                'attempt': 0
+            } for ticket_result in ticket_results]
 
-            record_metadata = await self.producer.send_and_wait(
-                topic,
-                key=ticket_result.zone_id,
-                value=ticket_result.to_dict(),
-                partition=int(ticket_result.zone_id[-1]) - 1
-            )
+            if self.pipelined:
+                loop = asyncio.get_running_loop()
+                for record in records:
+                    record['delivered'] = loop.create_future()
+                for record in records:
+                    await self.send_pipelined(record)
+                return asyncio.ensure_future(self.all_delivered(records))
 
-            # record_metadata = future.get(timeout=10)
-            logger.info(f"Ticket result sent to topic {record_metadata.topic} "
-                        f"partition {record_metadata.partition} "
-                        f"offset {record_metadata.offset}")
+            futures = []
+            for record in records:
+                futures.append(await self.producer.send(
+                    record['topic'],
+                    key=record['key'],
+                    value=record['value'],
+                    partition=record['partition'],
+                    headers=record['headers']
+                ))
+
+            await asyncio.gather(*futures)
+            logger.info(f"Sent {len(futures)} ticket results")
+            return self.settled(True)
+
+        except KafkaError as e:
+            logger.error(f"Failed to send ticket results to Kafka: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error sending ticket results: {e}")
+
+        # Records already handed over in pipelined mode may still arrive; the batch is replayed either way
+        return self.settled(False)
+
+    async def produce_dead_letters(self, entries: List[Dict[str, Any]]) -> bool:
+        """Produce tickets that could not be persisted to the dead-letter topic"""
+        if not self.producer:
+            await self.connect()
+            if not self.producer:
+                logger.error("Kafka producer not available")
+                return False
+
+        try:
+            futures = []
+            for entry in entries:
+                futures.append(await self.producer.send(
+                    kafka_config.ticket_dead_letter_topic,
+                    key=entry['zone_id'],
+                    value=entry
+                ))
+
+            await asyncio.gather(*futures)
+            logger.info(f"Sent {len(futures)} tickets to {kafka_config.ticket_dead_letter_topic}")
             return True
 
         except KafkaError as e:
-            logger.error(f"Failed to send ticket result to Kafka: {e}")
+            logger.error(f"Failed to send dead letters to Kafka: {e}")
             return False
         except Exception as e:
-            logger.error(f"Unexpected error sending ticket result: {e}")
+            logger.error(f"Unexpected error sending dead letters: {e}")
             return False
 
-    def close(self):
-        """Close the producer connection"""
+    async def close(self):
+        """Deliver pipelined records, then close the producer connection"""
         if self.producer:
-            self.producer.close()
+            await self.flush()
+            if self.reporter_task:
+                self.reporter_task.cancel()
+                self.reporter_task = None
+            await self.producer.stop()
+            self.producer = None
             logger.info("Kafka producer closed")
 
 
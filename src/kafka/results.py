@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+RESULT_REGISTRY_SIZE = Gauge(
+    "ticket_result_registry_size",
+    "Gauge of ticket results currently awaited by requests of this instance",
+)
+RESULT_REGISTRY_EVICTIONS = Counter(
+    "ticket_result_registry_evictions_total",
+    "Total count of awaited ticket results dropped from the registry by reason",
+    ["reason"],
+)
+
+
+class ResultRegistry:
+    """Per-ticket futures for results a local request is waiting on, bounded by size and age"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Insertion order is expiry order since every entry has the same ttl
+        self.waiters: OrderedDict[str, Tuple[asyncio.Future, float]] = OrderedDict()
+
+    def register(self, ticket_id: str) -> asyncio.Future:
+        """Start waiting for a ticket's result; call before the order is produced"""
+        self.evict_expired()
+        entry = self.waiters.get(ticket_id)
+        if entry:
+            return entry[0]
+
+        while len(self.waiters) >= self.maxsize:
+            self.evict_oldest('size')
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[ticket_id] = (future, time.monotonic() + self.ttl)
+        RESULT_REGISTRY_SIZE.set(len(self.waiters))
+        return future
+
+    def resolve(self, ticket_id: str, result: Dict[str, Any]) -> bool:
+        """Hand a result to its waiting request. Results nobody waits for are not kept"""
+        entry = self.waiters.get(ticket_id)
+        if not entry:
+            return False
+        future = entry[0]
+        if not future.done():
+            future.set_result(result)
+        return True
+
+    def discard(self, ticket_id: str):
+        entry = self.waiters.pop(ticket_id, None)
+        if entry and not entry[0].done():
+            entry[0].cancel()
+        RESULT_REGISTRY_SIZE.set(len(self.waiters))
+
+    def is_waiting(self, ticket_id: str) -> bool:
+        return ticket_id in self.waiters
+
+    async def wait(self, ticket_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for a registered ticket's result. Returns None on timeout or eviction"""
+        future = self.register(ticket_id)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.discard(ticket_id)
+
+    def evict_oldest(self, reason: str):
+        ticket_id, (future, _) = self.waiters.popitem(last=False)
+        # The waiting request gets no result, as on a timeout
+        if not future.done():
+            future.set_result(None)
+        RESULT_REGISTRY_EVICTIONS.labels(reason=reason).inc()
+        logger.warning(f"Dropped wait for ticket {ticket_id} from result registry ({reason})")
+
+    def evict_expired(self):
+        now = time.monotonic()
+        while self.waiters:
+            _, (_, deadline) = next(iter(self.waiters.items()))
+            if deadline > now:
+                break
+            self.evict_oldest('expired')
+        RESULT_REGISTRY_SIZE.set(len(self.waiters))
+
+    def __len__(self) -> int:
+        return len(self.waiters)
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import time
+from typing import Dict
+
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client import multiprocess
+
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def run_worker(worker_id: int):
+    """Entry point of a worker process: one TicketProcessor in the shared consumer group"""
+    # Ctrl+C reaches the whole process group; workers only stop when the supervisor says so
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Imported here so every worker opens its own Kafka, Redis and database connections
+    from src.kafka.processor import ticket_processor, start_ticket_processor
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, lambda: setattr(ticket_processor, 'running', False))
+        logger.info(f"Processor worker {worker_id} started with pid {os.getpid()}")
+        await start_ticket_processor()
+
+    asyncio.run(main())
+
+
+class ProcessorSupervisor:
+    """Runs processor workers in separate processes, restarts crashed ones and serves their metrics"""
+
+    def __init__(self, workers: int, metrics_port: int, shutdown_timeout: float):
+        self.workers = workers
+        self.metrics_port = metrics_port
+        self.shutdown_timeout = shutdown_timeout
+        # Spawned rather than forked so no client connection or thread is shared with the parent
+        self.context = multiprocessing.get_context('spawn')
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.started_at: Dict[int, float] = {}
+        self.restarts: Dict[int, int] = {}
+        self.restart_at: Dict[int, float] = {}
+        self.stopping = False
+
+    def prepare_metrics(self):
+        """Clear samples of previous runs and serve metrics aggregated over every worker"""
+        metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(self.metrics_port, registry=registry)
+        logger.info(f"Serving processor metrics on port {self.metrics_port}")
+
+    def start_worker(self, worker_id: int):
+        process = self.context.Process(target=run_worker, args=(worker_id,), name=f"ticket-processor-{worker_id}")
+        process.start()
+        self.processes[worker_id] = process
+        self.started_at[worker_id] = time.monotonic()
+        logger.info(f"Started processor worker {worker_id} (pid {process.pid})")
+
+    def check_workers(self):
+        """Restart workers that exited, backing off when one keeps crashing"""
+        now = time.monotonic()
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+
+            if worker_id not in self.restart_at:
+                multiprocess.mark_process_dead(process.pid)
+                # A worker that ran for a while before crashing starts over with the shortest delay
+                if now - self.started_at[worker_id] > 60:
+                    self.restarts[worker_id] = 0
+                restarts = self.restarts.get(worker_id, 0)
+                delay = min(2 ** restarts, 30)
+                self.restarts[worker_id] = restarts + 1
+                self.restart_at[worker_id] = now + delay
+                logger.error(f"Processor worker {worker_id} exited with code {process.exitcode}, "
+                             f"restarting in {delay}s")
+            elif now >= self.restart_at[worker_id]:
+                del self.restart_at[worker_id]
+                self.start_worker(worker_id)
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+
+    def shutdown(self):
+        """Ask every worker to drain and commit, killing those that exceed the timeout"""
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for worker_id, process in self.processes.items():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.error(f"Processor worker {worker_id} did not stop in time, killing it")
+                process.kill()
+                process.join()
+            multiprocess.mark_process_dead(process.pid)
+        logger.info("All processor workers stopped")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.prepare_metrics()
+        for worker_id in range(self.workers):
+            self.start_worker(worker_id)
+
+        while not self.stopping:
+            self.check_workers()
+            time.sleep(1)
+
+        logger.info("Stopping processor workers...")
+        self.shutdown()
+
+
+def run_supervisor(workers: int = None):
+    workers = workers or settings.PROCESSOR_WORKERS
+    supervisor = ProcessorSupervisor(
+        workers=workers,
+        metrics_port=settings.PROCESSOR_METRICS_PORT,
+        shutdown_timeout=settings.PROCESSOR_SHUTDOWN_TIMEOUT
+    )
+    supervisor.run()
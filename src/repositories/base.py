@@ -1,6 +1,6 @@
 from typing import TypeVar, Generic, Any
 from src.utils.database import db_session_context
-from src.utils.cache import cache_data , update_cache , invalidate_cache
+from src.utils.cache import cache_data , aupdate_cache , ainvalidate_keys, build_cache_key
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
@@ -9,6 +9,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: type[ModelType], id_field: str = "id"):
         self.model = model
         self.id = id_field
+        self.cache_namespace = model.__name__.lower()
+
+    def cache_tags(self, obj: Any) -> list[str]:
+        """Tags a cached record is invalidated with, besides its own key"""
+        return []
 
     @cache_data(expire_time=3600)
     def get(self, id: Any) -> ModelType | None:
@@ -41,8 +46,8 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.commit()
         db.refresh(obj)
 
-        cache_key = str(id)
-        update_cache(cache_key, obj, expire_time=3600)
+        cache_key = build_cache_key(self.cache_namespace, id)
+        await aupdate_cache(cache_key, obj, expire_time=3600, tags=self.cache_tags(obj))
 
         return obj
 
@@ -54,5 +59,5 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return None
         db.delete(obj)
         db.commit()
-        invalidate_cache(str(id))
+        await ainvalidate_keys([build_cache_key(self.cache_namespace, id)])
         return obj
\ No newline at end of file
@@ -2,9 +2,11 @@ from sqlalchemy.orm import Session, joinedload
 from src.entities.concert import Concert
 from src.dto.concert import ConcertCreate, ConcertUpdate
 from src.repositories.base import BaseRepository
-from src.utils.cache import cache_data
+from src.utils.cache import cache_data, concert_tag
+from src.utils.metadata import apublish_metadata_change
 from src.utils.database import db_session_context
 from src.utils.kafka_config import kafka_config
+from src.kafka.partitioner import zone_partitioner
 from uuid import uuid4
 import logging
 
@@ -15,6 +17,15 @@ class ConcertRepository(BaseRepository[Concert, ConcertCreate, ConcertUpdate]):
     def __init__(self):
         super().__init__(Concert)
 
+    def cache_tags(self, obj: Concert) -> list[str]:
+        return [concert_tag(obj.id)]
+
+    async def update(self, id: str, obj_in: ConcertUpdate) -> Concert | None:
+        concert = await super().update(id, obj_in)
+        if concert:
+            await apublish_metadata_change('concert', concert.id)
+        return concert
+
     @cache_data(expire_time=3600, use_result_id=True)
     def create(self, obj_in: ConcertCreate) -> Concert:
         db = db_session_context.get()
@@ -28,11 +39,12 @@ class ConcertRepository(BaseRepository[Concert, ConcertCreate, ConcertUpdate]):
         db.refresh(db_obj)
 
         try:
+            num_partitions = zone_partitioner.partition_count(obj_in.num_zones)
             kafka_config.create_concert_topics(
                 concert_id=id,
-                num_partitions=obj_in.num_zones
+                num_partitions=num_partitions
             )
-            logger.info(f"Created Kafka topics for concert {id} with {obj_in.num_zones} partitions")
+            logger.info(f"Created Kafka topics for concert {id} with {num_partitions} partitions")
         except Exception as e:
             logger.error(f"Failed to create Kafka topics for concert {id}: {e}")
 
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from sqlalchemy.orm import Session
 
 from src.kafka.consumer import ticket_result_consumer
@@ -8,8 +10,12 @@ from src.entities.zone import Zone
 from src.dto.ticket import TicketCreate, TicketUpdate, TicketDetail
 from src.repositories.base import BaseRepository
 from src.repositories.zone_repository import zone_repository
-from src.utils.cache import cache_data, update_cache
+from src.utils.cache import cache_data, update_cache, get_many_cached, build_cache_key, concert_tag
+from src.utils.inventory import seat_inventory
+from src.utils.ticket_status import ticket_status
+from src.utils.config import settings
 from src.kafka.producer import ticket_producer
+from typing import Any, AsyncIterator, Dict
 from uuid import uuid4
 import logging
 
@@ -20,10 +26,13 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
     def __init__(self):
         super().__init__(Ticket)
 
-    # @cache_data(expire_time=3600, use_result_id=True)
-    async def create(self,obj_in: TicketCreate) -> TicketDetail:
-        # db = db_session_context.get()
-        # First check if zone exists and has available seats
+    def cache_tags(self, obj: Any) -> list[str]:
+        # Ticket rows carry no concert; their details do
+        concert_id = getattr(obj, 'concert_id', None)
+        return [concert_tag(concert_id)] if concert_id else []
+
+    async def validate_order(self, obj_in: TicketCreate):
+        """Reject orders for unknown or sold-out zones before they reach Kafka"""
         zone = await zone_repository.get(obj_in.zone_id)
 
         if not zone:
@@ -32,8 +41,72 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
         if str(obj_in.concert_id) not in str(obj_in.zone_id):
             raise ValueError("Zone does not belong to the specified concert")
 
-        if zone.available_seats <= 0:
+        # Prefer the live seat counter over the cached zone row
+        available_seats = await seat_inventory.aavailable(obj_in.zone_id)
+        if available_seats is None:
+            available_seats = zone.available_seats
+
+        if available_seats <= 0:
             raise ValueError("No available seats in this zone")
+
+    async def create_async(self, obj_in: TicketCreate) -> str:
+        """Submit an order without waiting for its result; the outcome is read from the ticket status"""
+        await self.validate_order(obj_in)
+
+        ticket_id = str(uuid4())
+        ticket_order = TicketOrderEvent(
+            ticket_id=ticket_id,
+            zone_id=obj_in.zone_id,
+            concert_id=obj_in.concert_id,
+            reply_to=ticket_result_consumer.instance_id
+        )
+
+        # Pending is recorded first so the processor's outcome can never be overwritten by it
+        await ticket_status.aset_pending(ticket_id, obj_in.zone_id, obj_in.concert_id)
+        success = await ticket_producer.produce_ticket_order(ticket_order)
+        if not success:
+            await ticket_status.adelete(ticket_id)
+            raise RuntimeError("Failed to submit ticket order to processing queue")
+
+        logger.info(f"Ticket order {ticket_id} accepted for asynchronous processing")
+        return ticket_id
+
+    async def get_order_status(self, ticket_id: str) -> Dict[str, Any] | None:
+        """Status of an order, with the ticket details once it succeeded"""
+        status = await ticket_status.aget(ticket_id)
+        if not status:
+            return None
+        return await self.add_ticket_detail(status)
+
+    async def add_ticket_detail(self, status: Dict[str, Any]) -> Dict[str, Any]:
+        if status['status'] == 'success':
+            status['ticket'] = await ticket_result_consumer.build_ticket_detail(status)
+        return status
+
+    async def watch_order_status(self, ticket_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield an order's status whenever it changes, until it is final or the stream times out"""
+        deadline = time.monotonic() + settings.TICKET_STATUS_STREAM_TIMEOUT
+        last_status = None
+        async with ticket_status.awatch(ticket_id) as changes:
+            # Subscribed before the first read, so a change in between is not missed
+            status = await ticket_status.aget(ticket_id)
+            while status is not None:
+                if status['status'] != last_status:
+                    last_status = status['status']
+                    yield await self.add_ticket_detail(status)
+                remaining = deadline - time.monotonic()
+                if last_status != 'pending' or remaining <= 0:
+                    return
+                try:
+                    status = await asyncio.wait_for(changes.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return
+
+    # @cache_data(expire_time=3600, use_result_id=True)
+    async def create(self,obj_in: TicketCreate) -> TicketDetail:
+        # db = db_session_context.get()
+        # First check if zone exists and has available seats
+        await self.validate_order(obj_in)
         #
         # concert = await concert_repository.get(zone.concert_id)
 
@@ -42,11 +115,15 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
         ticket_order = TicketOrderEvent(
             ticket_id=ticket_id,
             zone_id=obj_in.zone_id,
-            concert_id=obj_in.concert_id
+            concert_id=obj_in.concert_id,
+            reply_to=ticket_result_consumer.instance_id
         )
 
+        ticket_result_consumer.register_ticket(ticket_id)
+        await ticket_status.aset_pending(ticket_id, obj_in.zone_id, obj_in.concert_id)
         success = await ticket_producer.produce_ticket_order(ticket_order)
         if not success:
+            ticket_result_consumer.discard_ticket(ticket_id)
             raise RuntimeError("Failed to submit ticket order to processing queue")
 
         logger.info(f"Ticket order {ticket_id} submitted to Kafka")
@@ -65,7 +142,9 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
             else:
                 raise RuntimeError(error_message)
 
-        ticket_data = result.get('ticket_data', {})
+        ticket_data = await ticket_result_consumer.build_ticket_detail(result)
+        if not ticket_data:
+            raise ValueError("Zone not found")
         return TicketDetail(**ticket_data)
 
         # Create the ticket
@@ -102,7 +181,7 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
         #     db.rollback()
         #     raise HTTPException(status_code=500, detail=str(e))
 
-    @cache_data(expire_time=3600)
+    @cache_data(expire_time=3600, namespace='ticket_detail')
     async def get_with_details(self, ticket_id: str) -> TicketDetail | None:
         db = db_session_context.get()
         from src.repositories.zone_repository import zone_repository
@@ -132,26 +211,26 @@ class TicketRepository(BaseRepository[Ticket, TicketCreate, TicketUpdate]):
             zone_description=zone.description if zone else None
         )
 
-    async def get_by_concert(self,concert_id: str) -> list[Ticket]:
-        db = db_session_context.get()
-        tickets = db.query(self.model).join(Zone).filter(Zone.concert_id == concert_id).all()
+    async def get_many_with_details(self, ticket_ids: list[str]) -> list[TicketDetail]:
+        """get_with_details for many tickets, reading every cached detail in one MGET"""
+        cached = await get_many_cached([build_cache_key('ticket_detail', ticket_id) for ticket_id in ticket_ids])
+
         result = []
-        for ticket in tickets:
-            ticket_detail = await self.get_with_details(ticket.id)
+        for ticket_id, ticket_detail in zip(ticket_ids, cached):
+            if ticket_detail is None:
+                ticket_detail = await self.get_with_details(ticket_id)
             if ticket_detail:
                 result.append(ticket_detail)
         return result
 
+    async def get_by_concert(self,concert_id: str) -> list[Ticket]:
+        db = db_session_context.get()
+        tickets = db.query(self.model).join(Zone).filter(Zone.concert_id == concert_id).all()
+        return await self.get_many_with_details([ticket.id for ticket in tickets])
+
     async def get_by_zone(self, zone_id: str) -> list[Ticket]:
         db = db_session_context.get()
         tickets = db.query(self.model).filter(self.model.zone_id == zone_id).all()
-
-        result = []
-        for ticket in tickets:
-            ticket_detail = await self.get_with_details(ticket.id)
-            if ticket_detail:
-                result.append(ticket_detail)
-
-        return result
+        return await self.get_many_with_details([ticket.id for ticket in tickets])
 
 ticket_repository = TicketRepository()
\ No newline at end of file
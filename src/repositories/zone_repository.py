@@ -1,3 +1,4 @@
+import asyncio
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from src.utils.database import db_session_context
@@ -5,13 +6,20 @@ from src.entities.zone import Zone
 from src.dto.zone import ZoneCreate, ZoneUpdate
 from src.repositories.base import BaseRepository
 from src.repositories.concert_repository import concert_repository
-from src.utils.cache import cache_data
+from src.utils.cache import cache_data, concert_tag
+from src.utils.inventory import seat_inventory
+from src.utils.metadata import apublish_metadata_change
+from src.utils.kafka_config import kafka_config
+from src.kafka.partitioner import zone_partitioner
 
 
 class ZoneRepository(BaseRepository[Zone, ZoneCreate, ZoneUpdate]):
     def __init__(self):
         super().__init__(Zone)
 
+    def cache_tags(self, obj: Zone) -> list[str]:
+        return [concert_tag(obj.concert_id)]
+
     @cache_data(expire_time=3600, use_result_id=True)
     async def create(self, obj_in: ZoneCreate) -> Zone:
         db = db_session_context.get()
@@ -36,8 +44,42 @@ class ZoneRepository(BaseRepository[Zone, ZoneCreate, ZoneUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+
+        await asyncio.to_thread(seat_inventory.seed, db_obj.id, db_obj.available_seats)
         return db_obj
 
+    async def update(self, id: str, obj_in: ZoneUpdate) -> Zone | None:
+        zone = await super().update(id, obj_in)
+        if zone:
+            await apublish_metadata_change('zone', zone.id)
+        if zone and obj_in.available_seats is not None:
+            await asyncio.to_thread(seat_inventory.reset, zone.id, zone.available_seats)
+        return zone
+
+    async def split(self, zone_id: str, partitions: int) -> Zone | None:
+        """Spread a hot zone's orders and remaining seats over several partitions of its block"""
+        if partitions > zone_partitioner.partitions_per_zone:
+            raise ValueError(f"A zone can be split over at most {zone_partitioner.partitions_per_zone} partitions")
+
+        zone = await self.get(zone_id)
+        if not zone:
+            return None
+
+        # Topics without a block of partitions per zone route every order of a zone to one partition
+        concert = await concert_repository.get(zone.concert_id)
+        topic = kafka_config.get_concert_order_topic(zone.concert_id)
+        num_partitions = await asyncio.to_thread(kafka_config.get_partition_count, topic)
+        if num_partitions is None or not zone_partitioner.has_zone_blocks(num_partitions, concert.num_zones):
+            raise ValueError(f"Topic {topic} has {num_partitions or 0} partitions, a split needs "
+                             f"{zone_partitioner.partition_count(concert.num_zones)}")
+
+        # Shares must exist before orders are routed to the new sub-partitions
+        if await asyncio.to_thread(seat_inventory.redistribute, zone_id, partitions) is None:
+            await asyncio.to_thread(seat_inventory.seed, zone_id, zone.available_seats)
+            await asyncio.to_thread(seat_inventory.redistribute, zone_id, partitions)
+        zone_partitioner.set_split(zone_id, partitions)
+        return zone
+
     def get_by_concert(self, db: Session, concert_id: str) -> list[Zone]:
         return db.query(self.model).filter(self.model.concert_id == concert_id).all()
 
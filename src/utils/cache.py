@@ -1,28 +1,236 @@
 # src/cache.py
+import asyncio
 import json
+import math
+import orjson
+import random
 import redis
+import redis.asyncio as aioredis
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import field as dataclass_field, make_dataclass
+from datetime import datetime
 from functools import wraps
+from uuid import uuid4
 import inspect
 import logging
 from typing import Any, Callable, TypeVar
+from sqlalchemy import DateTime
 from sqlalchemy.orm import Session
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
 # Create Redis connection
+# Synchronous client for threads and sync code (processor persistence, Lua inventory scripts, pub/sub)
 redis_client = redis.Redis(
-    host=settings.REDIS_HOST,
-    port=settings.REDIS_PORT,
-    db=0,
-    decode_responses=True
+    connection_pool=redis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=0,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS
+    )
+)
+
+# Asynchronous client for code running on the event loop, so cache round trips never block it
+async_redis_client = aioredis.Redis(
+    connection_pool=aioredis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=0,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS
+    )
 )
 
 T = TypeVar('T')
 
+# Cache writes are broadcast on this channel so other processes can drop their in-memory copies
+INVALIDATION_CHANNEL = 'cache-invalidations'
+INSTANCE_ID = uuid4().hex
+
+# Pre-rendered response bodies are stored next to the entry they were rendered from
+RESPONSE_PREFIX = 'response:'
+
+_invalidation_callbacks: list[Callable[[str], None]] = []
+_invalidation_thread = None
+_local_listening = False
+
+# Cache misses being loaded by this process, so concurrent requests for a key share one load
+_loads_in_flight: dict[str, asyncio.Future] = {}
+_LOAD_FAILED = object()
+
+# In-process stand-in for a key whose record does not exist
+_MISSING = object()
+
+# Keys being refreshed in the background, and the tasks doing it (kept referenced until done)
+_refreshes_in_flight: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+# Only the process holding a load lock may release it
+_release_lock_script = async_redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[str, Any], bool]):
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# In-process tier in front of Redis, kept coherent through the invalidation channel
+local_cache = TTLCache(maxsize=settings.LOCAL_CACHE_SIZE, ttl=settings.LOCAL_CACHE_TTL)
+
+
+def publish_invalidation(keys: list[str]):
+    """Tell every other process that the given cache keys changed"""
+    try:
+        message = json.dumps({'origin': INSTANCE_ID, 'keys': keys})
+        redis_client.publish(INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        logger.error(f"Failed to publish cache invalidation: {e}")
+
+
+async def apublish_invalidation(keys: list[str]):
+    try:
+        message = json.dumps({'origin': INSTANCE_ID, 'keys': keys})
+        await async_redis_client.publish(INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        logger.error(f"Failed to publish cache invalidation: {e}")
+
+
+def _handle_invalidation(message):
+    try:
+        data = json.loads(message['data'])
+        # Writes made by this process have already been applied locally
+        if data.get('origin') == INSTANCE_ID:
+            return
+        for key in data.get('keys', []):
+            for callback in _invalidation_callbacks:
+                callback(key)
+    except Exception as e:
+        logger.error(f"Failed to handle cache invalidation: {e}")
+
+
+def subscribe_invalidations(callback: Callable[[str], None]):
+    """Register a callback(key) for invalidations published by other processes"""
+    global _invalidation_thread
+    _invalidation_callbacks.append(callback)
+
+    if _invalidation_thread is None:
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: _handle_invalidation})
+            _invalidation_thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+            logger.info(f"Listening for cache invalidations on {INVALIDATION_CHANNEL}")
+        except Exception as e:
+            logger.error(f"Failed to subscribe to cache invalidations: {e}")
+
+
+def build_cache_key(namespace: str, id: Any) -> str:
+    """Versioned key of a cached record; bumping CACHE_VERSION orphans every entry of an older shape"""
+    return f"{settings.CACHE_VERSION}:{namespace}:{id}"
+
+
+def parse_cache_key(key: str) -> tuple[str, str] | None:
+    """(namespace, id) of a key built by build_cache_key for the current version"""
+    version, _, rest = key.partition(':')
+    namespace, _, id = rest.partition(':')
+    if version != settings.CACHE_VERSION or not id:
+        return None
+    return namespace, id
+
+
+def tag_key(tag: str) -> str:
+    return f"{settings.CACHE_VERSION}:tag:{tag}"
+
+
+def concert_tag(concert_id: str) -> str:
+    """Tag of a concert and every cached record under it"""
+    return f"concert:{concert_id}"
+
+
+def response_key(key: str) -> str:
+    return f"{RESPONSE_PREFIX}{key}"
+
+
+def negative_key(key: str) -> str:
+    """Key recording that the record of a cache key does not exist, kept apart from the entry itself"""
+    return f"neg:{key}"
+
+
+def invalidate_local(key: str):
+    """Drop the in-process copies of a cache key and of responses rendered from it"""
+    local_cache.delete(key)
+    local_cache.delete(response_key(key))
+
+
+def listen_for_invalidations():
+    """Enable the in-process tier; it is only used once other processes' writes can reach it"""
+    global _local_listening
+    if not _local_listening:
+        subscribe_invalidations(invalidate_local)
+        _local_listening = True
+
+
+def cache_locally(key: str, value: Any, expire_time: int):
+    if _local_listening:
+        local_cache.set(key, value, ttl=min(expire_time, local_cache.ttl))
+
+
+def cache_encoded_locally(key: str, encoded: str | bytes, expire_time: int):
+    """Keep the decoded read model of an entry, never the session-bound instance it was encoded from"""
+    if _local_listening:
+        cache_locally(key, decode_cached(encoded), expire_time)
+
 
 def serialize_model_with_relationships(obj):
-    """Serialize SQLAlchemy model with its relationships"""
+    """Serialize an object without a registered codec, including its relationships"""
     if not hasattr(obj, '__dict__'):
         return obj
 
@@ -41,63 +249,279 @@ def serialize_model_with_relationships(obj):
     return result
 
 
-def reconstruct_model_with_relationships(model_class, data_dict):
-    """Reconstruct SQLAlchemy model with relationships from dict"""
-    # Import zone model to handle relationship reconstruction
-    from src.entities.zone import Zone
-
-    # Separate main model data from relationship data
-    main_data = {}
-    relationship_data = {}
+class ModelCodec:
+    """Cache encoder/decoder of one type, compiled once from its columns or fields"""
+
+    def __init__(self, name: str, fields: list[str], datetime_fields: list[str], build: Callable[..., Any],
+                 relationships: dict[str, str] | None = None):
+        self.name = name
+        self.fields = fields
+        self.datetime_fields = datetime_fields
+        self.build = build
+        # Relationship attribute -> name of the codec of its items
+        self.relationships = relationships or {}
+
+    def is_complete(self, obj: Any) -> bool:
+        """Whether every relationship of an ORM instance is loaded, so it can be cached as a whole"""
+        state = getattr(obj, '_sa_instance_state', None)
+        return state is None or not any(rel_name in state.unloaded for rel_name in self.relationships)
+
+    def encode(self, obj: Any) -> dict:
+        data = {field_name: getattr(obj, field_name) for field_name in self.fields}
+        state = getattr(obj, '_sa_instance_state', None)
+        for rel_name, codec_name in self.relationships.items():
+            # Never trigger a lazy load just to fill the cache
+            if state is not None and rel_name in state.unloaded:
+                continue
+            items = getattr(obj, rel_name, None)
+            if items is not None:
+                codec = get_codec(codec_name)
+                data[rel_name] = [codec.encode(item) for item in items]
+        data['_cached_type'] = self.name
+        return data
+
+    def decode(self, data: dict) -> Any:
+        values = {field_name: data[field_name] for field_name in self.fields if field_name in data}
+        for field_name in self.datetime_fields:
+            value = values.get(field_name)
+            if isinstance(value, str):
+                values[field_name] = datetime.fromisoformat(value)
+        for rel_name, codec_name in self.relationships.items():
+            if data.get(rel_name) is not None:
+                codec = get_codec(codec_name)
+                values[rel_name] = [codec.decode(item) for item in data[rel_name]]
+        return self.build(**values)
+
+
+_codecs: dict[str, ModelCodec] = {}
+
+
+def entity_codec(model_class, relationships: dict[str, str] | None = None) -> ModelCodec:
+    """Codec of an ORM entity that decodes into a slotted read model instead of a transient ORM object"""
+    columns = model_class.__mapper__.column_attrs
+    fields = [column.key for column in columns]
+    datetime_fields = [column.key for column in columns if isinstance(column.columns[0].type, DateTime)]
+    relationships = relationships or {}
+
+    record_class = make_dataclass(
+        f"{model_class.__name__}Record",
+        [(name, Any, dataclass_field(default=None)) for name in fields]
+        + [(name, Any, dataclass_field(default_factory=list)) for name in relationships],
+        slots=True
+    )
+    record_class.cached_type = model_class.__name__
+    return ModelCodec(model_class.__name__, fields, datetime_fields, record_class, relationships)
+
+
+def schema_codec(schema_class) -> ModelCodec:
+    """Codec of a Pydantic DTO, decoded without re-running validation"""
+    fields = list(schema_class.model_fields)
+    datetime_fields = [name for name, info in schema_class.model_fields.items() if info.annotation is datetime]
+    return ModelCodec(schema_class.__name__, fields, datetime_fields, schema_class.model_construct)
+
+
+def get_codec(name: str | None) -> ModelCodec | None:
+    if not _codecs:
+        from src.entities.venue import Venue
+        from src.entities.concert import Concert
+        from src.entities.zone import Zone
+        from src.entities.ticket import Ticket
+        from src.dto.ticket import TicketDetail
+
+        for codec in (
+            entity_codec(Venue),
+            entity_codec(Concert, relationships={'zones': 'Zone'}),
+            entity_codec(Zone),
+            entity_codec(Ticket),
+            schema_codec(TicketDetail)
+        ):
+            _codecs[codec.name] = codec
+    return _codecs.get(name)
+
+
+def cached_type_of(obj: Any) -> str:
+    # Read models decoded from the cache keep the name of the type they were encoded from
+    return getattr(type(obj), 'cached_type', type(obj).__name__)
+
+
+def can_write_through(obj: Any) -> bool:
+    """Whether an object can be cached as it is; instances with unloaded relationships are invalidated instead"""
+    codec = get_codec(cached_type_of(obj))
+    return codec is None or codec.is_complete(obj)
+
+
+def encode_cached(result: Any, cached_at: float | None = None, delta: float = 0.0) -> bytes:
+    """
+    Serialize a repository result for the cache, tagging its type for decoding
 
-    # Get relationship names from the model
-    if hasattr(model_class, '__mapper__'):
-        relationship_names = [rel.key for rel in model_class.__mapper__.relationships]
+    Args:
+        cached_at: Wall-clock time the result was loaded, used for the soft TTL
+        delta: Seconds it took to load, used for early refresh
+    """
+    codec = get_codec(cached_type_of(result))
+    if codec is not None:
+        cache_data = codec.encode(result)
+    elif hasattr(result, 'model_dump'):  # Other Pydantic models
+        cache_data = result.model_dump()
     else:
-        relationship_names = []
+        cache_data = dict(serialize_model_with_relationships(result))
+    if cached_at is not None:
+        cache_data['_cached_at'] = cached_at
+        cache_data['_delta'] = delta
+    return orjson.dumps(cache_data, default=str)
 
-    for key, value in data_dict.items():
-        if key in relationship_names:
-            relationship_data[key] = value
-        else:
-            main_data[key] = value
-
-    # Create main model instance
-    instance = model_class(**main_data)
-
-    # Set relationships - reconstruct as proper model instances
-    for rel_name, rel_data in relationship_data.items():
-        if isinstance(rel_data, list):
-            # Handle one-to-many relationships (like zones)
-            if rel_name == 'zones':
-                # Convert dict data back to Zone instances
-                zone_instances = []
-                for zone_dict in rel_data:
-                    zone_instance = Zone(**zone_dict)
-                    zone_instances.append(zone_instance)
-                setattr(instance, rel_name, zone_instances)
-            else:
-                setattr(instance, rel_name, rel_data)
-        else:
-            # Handle one-to-one relationships
-            setattr(instance, rel_name, rel_data)
 
-    return instance
+def decode_entry(cached_data: str | bytes, model_class=None) -> tuple[Any, float | None, float]:
+    """Decoded result of a cache entry with the time it was loaded and how long loading took"""
+    data_dict = orjson.loads(cached_data)
+    cached_type = data_dict.pop('_cached_type', None)
+    cached_at = data_dict.pop('_cached_at', None)
+    delta = data_dict.pop('_delta', 0.0)
+    if cached_type is None and model_class is not None:
+        cached_type = model_class.__name__
+
+    codec = get_codec(cached_type)
+    if codec is not None:
+        return codec.decode(data_dict), cached_at, delta
+    return data_dict, cached_at, delta
 
 
-def cache_data(expire_time: int = 3600, use_result_id: bool = False):
+def decode_cached(cached_data: str | bytes, model_class=None) -> Any:
+    return decode_entry(cached_data, model_class)[0]
+
+
+def needs_refresh(cached_at: float | None, delta: float, soft_ttl: float) -> bool:
+    """
+    Whether an entry should be reloaded: always once past its soft TTL, and before that
+    with a probability that grows near expiry and with the cost of loading it (XFetch)
+    """
+    if cached_at is None:
+        return False
+    early = -delta * settings.CACHE_XFETCH_BETA * math.log(1.0 - random.random())
+    return time.time() + early >= cached_at + soft_ttl
+
+
+async def get_many_cached(keys: list[str], model_class=None) -> list[Any]:
+    """Fetch and decode several cache entries in one MGET; misses and undecodable entries are None"""
+    results = [local_cache.get(key) for key in keys]
+    results = [None if result is _MISSING else result for result in results]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    try:
+        values = await async_redis_client.mget([keys[i] for i in missing])
+    except Exception as e:
+        logger.error(f"Failed to read cache entries: {e}")
+        return results
+
+    for i, value in zip(missing, values):
+        if not value:
+            continue
+        try:
+            results[i] = decode_cached(value, model_class)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Failed to decode cached data for key {keys[i]}: {e}")
+    return results
+
+
+async def acquire_load_lock(cache_key: str) -> tuple[str | None, str | None, bool]:
+    """
+    Take the cross-process lock for loading a key from the database
+
+    Returns (token, None, False) when the lock was taken. When another process holds it, waits for
+    that process to load the key and returns (None, cached_data, missing); missing is True if that
+    process found no record. cached_data is None and missing False if the lock expired or was
+    released without either being recorded, and the caller loads the key itself.
+    """
+    lock_key = f"lock:{cache_key}"
+    token = uuid4().hex
+    try:
+        if await async_redis_client.set(lock_key, token, nx=True, px=settings.CACHE_LOCK_TTL_MS):
+            return token, None, False
+
+        deadline = time.monotonic() + settings.CACHE_LOCK_TTL_MS / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_MS / 1000)
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(cache_key).exists(negative_key(cache_key)).exists(lock_key)
+                cached_data, missing, locked = await pipe.execute()
+            if cached_data or missing or not locked:
+                return None, cached_data, bool(missing and not cached_data)
+    except Exception as e:
+        logger.error(f"Failed to coordinate load of key {cache_key}: {e}")
+    return None, None, False
+
+
+async def release_load_lock(cache_key: str, token: str):
+    try:
+        await _release_lock_script(keys=[f"lock:{cache_key}"], args=[token])
+    except Exception as e:
+        logger.error(f"Failed to release load lock of key {cache_key}: {e}")
+
+
+async def astore_cached(key: str, encoded: str | bytes, expire_time: int, tags: list[str] | None = None) -> bool:
+    """
+    Write an encoded entry, drop its negative entry and record it under its tags, in one round trip
+
+    Returns whether a negative entry was dropped, i.e. whether other processes may still hold one.
+    """
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.setex(key, expire_time, encoded)
+        pipe.delete(negative_key(key))
+        for tag in tags or ():
+            pipe.sadd(tag_key(tag), key)
+            pipe.expire(tag_key(tag), expire_time)
+        results = await pipe.execute()
+    return bool(results[1])
+
+
+async def acache_missing(key: str):
+    """Remember for a short while that a key's record does not exist"""
+    try:
+        await async_redis_client.setex(negative_key(key), settings.NEGATIVE_CACHE_TTL, 1)
+    except Exception as e:
+        logger.error(f"Failed to cache missing record for key {key}: {e}")
+    cache_locally(key, _MISSING, settings.NEGATIVE_CACHE_TTL)
+
+
+def clear_missing(keys: list[str]):
+    """Drop the negative entries of keys whose records were just created"""
+    if not keys:
+        return
+    try:
+        if redis_client.delete(*[negative_key(key) for key in keys]):
+            for key in keys:
+                invalidate_local(key)
+            publish_invalidation(keys)
+    except Exception as e:
+        logger.error(f"Failed to clear missing records: {e}")
+
+
+def cache_data(expire_time: int = 3600, use_result_id: bool = False, namespace: str | None = None,
+               soft_ttl: int | None = None):
     """
     Decorator for caching function results in Redis
 
     Args:
-        expire_time: Time in seconds before cache expires
+        expire_time: Time in seconds before cache expires (hard TTL)
         use_result_id: If True, use the result's ID field for cache key (for create operations)
+        namespace: Key namespace; defaults to the repository's cache_namespace
+        soft_ttl: Age in seconds after which a hit is still served but reloaded in the background;
+            defaults to CACHE_SOFT_TTL_RATIO of expire_time
     """
+    if soft_ttl is None:
+        soft_ttl = int(expire_time * settings.CACHE_SOFT_TTL_RATIO)
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             repo_instance = args[0] if args and hasattr(args[0], 'model') else None
+            model_class = repo_instance.model if repo_instance else None
+            key_namespace = namespace or getattr(repo_instance, 'cache_namespace', func.__name__)
+
+            def tags_of(result) -> list[str]:
+                return repo_instance.cache_tags(result) if hasattr(repo_instance, 'cache_tags') else []
 
             if use_result_id:
                 if inspect.iscoroutinefunction(func):
@@ -106,26 +530,26 @@ def cache_data(expire_time: int = 3600, use_result_id: bool = False):
                     result = func(*args, **kwargs)
 
                 if result and hasattr(result, 'id'):
-                    cache_key = f"{result.id}"
+                    cache_key = build_cache_key(key_namespace, result.id)
                 else:
                     return result
 
                 logger.debug(f"Cache key (from result): {cache_key}")
 
+                if not can_write_through(result):
+                    # Relationships were expired by the commit; the next read loads the full record
+                    await ainvalidate_keys([cache_key])
+                    return result
+
+                encoded = encode_cached(result, cached_at=time.time())
                 try:
-                    # Handle both Pydantic models and SQLAlchemy models
-                    if hasattr(result, 'dict'):  # Pydantic model
-                        cache_data = result.dict()
-                        cache_data['_cached_type'] = 'TicketDetail'
-                    else:  # SQLAlchemy model
-                        cache_data = serialize_model_with_relationships(result)
-                        cache_data['_cached_type'] = type(result).__name__
-
-                    serialized = json.dumps(cache_data, default=str)
-                    redis_client.setex(cache_key, expire_time, serialized)
+                    if await astore_cached(cache_key, encoded, expire_time, tags_of(result)):
+                        # Other processes may still remember the id as missing
+                        await apublish_invalidation([cache_key])
                     logger.info(f"Cached data for key: {cache_key}")
                 except Exception as e:
                     logger.error(f"Failed to cache data: {e}")
+                cache_encoded_locally(cache_key, encoded, expire_time)
 
                 return result
 
@@ -140,83 +564,227 @@ def cache_data(expire_time: int = 3600, use_result_id: bool = False):
                 if not isinstance(v, Session):
                     key_parts.append(f"{k}={v}")
 
-            cache_key = f"{''.join(key_parts)}"
+            cache_key = build_cache_key(key_namespace, ''.join(key_parts))
             logger.debug(f"Cache key: {cache_key}")
 
-            cached_data = redis_client.get(cache_key)
-            if cached_data:
-                logger.info(f"Cache hit for key: {cache_key}")
-                try:
-                    data_dict = json.loads(cached_data)
-                    cached_type = data_dict.pop('_cached_type', None)
-
-                    if cached_type == 'TicketDetail':
-                        from src.dto.ticket import TicketDetail
-                        return TicketDetail(**data_dict)
-                    elif repo_instance and hasattr(repo_instance, 'model'):
-                        return reconstruct_model_with_relationships(repo_instance.model, data_dict)
-                    return data_dict
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.error(f"Failed to decode cached data: {e}")
-                    redis_client.delete(cache_key)  # Clear corrupted cache
-
-            logger.debug(f"Cache miss for key: {cache_key}")
-
+            local_result = local_cache.get(cache_key)
+            if local_result is _MISSING:
+                return None
+            if local_result is not None:
+                logger.debug(f"Local cache hit for key: {cache_key}")
+                return local_result
+
+            loading = _loads_in_flight.get(cache_key)
+            if loading is not None:
+                # Another request of this process is already loading the key; share its result
+                encoded = await asyncio.shield(loading)
+                if encoded is _MISSING:
+                    logger.debug(f"Coalesced load for key: {cache_key}")
+                    return None
+                if encoded is not _LOAD_FAILED and encoded is not None:
+                    logger.debug(f"Coalesced load for key: {cache_key}")
+                    return decode_cached(encoded, model_class)
+                # The load failed or its result could not be cached as it was; load the key here
+
+            loading = asyncio.get_running_loop().create_future()
+            _loads_in_flight[cache_key] = loading
+            encoded = _LOAD_FAILED
+            try:
+                result, encoded = await load(cache_key, model_class, tags_of, args, kwargs)
+                return result
+            finally:
+                if _loads_in_flight.get(cache_key) is loading:
+                    del _loads_in_flight[cache_key]
+                loading.set_result(encoded)
+
+        async def load(cache_key: str, model_class, tags_of, args, kwargs) -> tuple[Any, Any]:
+            """Result of a cache miss in this process, read from Redis or the database; also returns it
+            encoded for coalesced requests, _MISSING when the record does not exist and None when the
+            result could not be cached"""
+            try:
+                cached_data, missing = await async_redis_client.mget([cache_key, negative_key(cache_key)])
+            except Exception as e:
+                logger.error(f"Failed to read cache: {e}")
+                cached_data = missing = None
+
+            if not cached_data and not missing and settings.CACHE_LOCK_ENABLED:
+                lock_token, cached_data, missing = await acquire_load_lock(cache_key)
+            else:
+                lock_token = None
+
+            if missing and not cached_data:
+                logger.debug(f"Negative cache hit for key: {cache_key}")
+                cache_locally(cache_key, _MISSING, settings.NEGATIVE_CACHE_TTL)
+                return None, _MISSING
+
+            try:
+                if cached_data:
+                    logger.info(f"Cache hit for key: {cache_key}")
+                    try:
+                        result, cached_at, delta = decode_entry(cached_data, model_class)
+                        if needs_refresh(cached_at, delta, soft_ttl):
+                            # Serve the cached value now and reload it off the request path
+                            schedule_refresh(cache_key, tags_of, args, kwargs)
+                        cache_locally(cache_key, result, expire_time)
+                        return result, cached_data
+                    except (json.JSONDecodeError, TypeError) as e:
+                        logger.error(f"Failed to decode cached data: {e}")
+                        await async_redis_client.delete(cache_key)  # Clear corrupted cache
+
+                logger.debug(f"Cache miss for key: {cache_key}")
+
+                result, encoded = await compute(cache_key, tags_of, args, kwargs)
+                return result, encoded
+            finally:
+                if lock_token:
+                    await release_load_lock(cache_key, lock_token)
+
+        async def compute(cache_key: str, tags_of, args, kwargs) -> tuple[Any, Any]:
+            started = time.monotonic()
             if inspect.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
             else:
                 result = func(*args, **kwargs)
+            delta = time.monotonic() - started
 
-            if result:
+            encoded = None
+            if result and can_write_through(result):
+                encoded = encode_cached(result, cached_at=time.time(), delta=delta)
                 try:
-                    # Handle both Pydantic models and SQLAlchemy models
-                    if hasattr(result, 'dict'):  # Pydantic model
-                        cache_data = result.dict()
-                        cache_data['_cached_type'] = 'TicketDetail'
-                    else:  # SQLAlchemy model
-                        cache_data = serialize_model_with_relationships(result)
-                        cache_data['_cached_type'] = type(result).__name__
-
-                    serialized = json.dumps(cache_data, default=str)
-                    redis_client.setex(cache_key, expire_time, serialized)
+                    await astore_cached(cache_key, encoded, expire_time, tags_of(result))
                     logger.info(f"Cached data for key: {cache_key}")
                 except Exception as e:
                     logger.error(f"Failed to cache data: {e}")
-
-            return result
+                cache_encoded_locally(cache_key, encoded, expire_time)
+            elif result is None:
+                await acache_missing(cache_key)
+                encoded = _MISSING
+
+            return result, encoded
+
+        def schedule_refresh(cache_key: str, tags_of, args, kwargs):
+            if cache_key in _refreshes_in_flight:
+                return
+            _refreshes_in_flight.add(cache_key)
+            task = asyncio.create_task(refresh(cache_key, tags_of, args, kwargs))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+
+        async def refresh(cache_key: str, tags_of, args, kwargs):
+            """Reload an entry in the background, on a database session of its own"""
+            from src.utils.database import SessionLocal, db_session_context
+
+            lock_token = None
+            db = SessionLocal()
+            try:
+                if settings.CACHE_LOCK_ENABLED:
+                    lock_token = uuid4().hex
+                    if not await async_redis_client.set(
+                            f"lock:{cache_key}", lock_token, nx=True, px=settings.CACHE_LOCK_TTL_MS):
+                        # Another process is already reloading it
+                        lock_token = None
+                        return
+
+                # The request that triggered the refresh may have closed its session by now
+                db_session_context.set(db)
+                args = tuple(db if isinstance(arg, Session) else arg for arg in args)
+                kwargs = {k: db if isinstance(v, Session) else v for k, v in kwargs.items()}
+                await compute(cache_key, tags_of, args, kwargs)
+                logger.info(f"Refreshed cache for key: {cache_key}")
+            except Exception as e:
+                logger.error(f"Failed to refresh cache for key {cache_key}: {e}")
+            finally:
+                db.close()
+                _refreshes_in_flight.discard(cache_key)
+                if lock_token:
+                    await release_load_lock(cache_key, lock_token)
 
         return async_wrapper
     return decorator
 
-def invalidate_cache(key_pattern: str):
-    """Clear cache entries matching the given pattern"""
-    # Use SCAN instead of KEYS for better performance
-    cursor = 0
-    keys_to_delete = []
-    while True:
-        cursor, keys = redis_client.scan(cursor, match=key_pattern, count=100)
-        keys_to_delete.extend(keys)
-        if cursor == 0:
-            break
 
-    if keys_to_delete:
-        redis_client.delete(*keys_to_delete)
-        logger.info(f"Invalidated {len(keys_to_delete)} cache entries")
+async def ainvalidate_keys(keys: list[str]):
+    """Clear the given cache entries, their negative entries and the responses rendered from them"""
+    if not keys:
+        return
+    await async_redis_client.delete(
+        *keys, *[response_key(key) for key in keys], *[negative_key(key) for key in keys]
+    )
+    logger.info(f"Invalidated {len(keys)} cache entries")
+
+    for key in keys:
+        invalidate_local(key)
+    await apublish_invalidation(keys)
+
 
+async def ainvalidate_tag(tag: str):
+    """Clear every cache entry recorded under a tag, costing O(entries in the tag) instead of a SCAN"""
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        # Read and drop the tag atomically, so entries cached meanwhile keep a fresh tag set
+        members, _ = await pipe.smembers(tag_key(tag)).delete(tag_key(tag)).execute()
+    await ainvalidate_keys(list(members))
 
-def update_cache(key: str, data: Any, expire_time: int = 3600):
+
+async def aupdate_cache(key: str, data: Any, expire_time: int = 3600, tags: list[str] | None = None):
     """Update cache with new data"""
+    if not can_write_through(data):
+        await ainvalidate_keys([key])
+        return
+
     try:
-        if hasattr(data, '__dict__'):
-            cache_data = {}
-            for k, v in data.__dict__.items():
-                if not k.startswith('_'):
-                    cache_data[k] = v
-        else:
-            cache_data = data
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, expire_time, encode_cached(data, cached_at=time.time()))
+            pipe.delete(response_key(key))
+            for tag in tags or ():
+                pipe.sadd(tag_key(tag), key)
+                pipe.expire(tag_key(tag), expire_time)
+            await pipe.execute()
+        logger.info(f"Updated cache for key: {key}")
+    except Exception as e:
+        logger.error(f"Failed to update cache: {e}")
+
+    invalidate_local(key)
+    await apublish_invalidation([key])
+
+
+def invalidate_keys(keys: list[str]):
+    """Synchronous version of ainvalidate_keys for threads and sync code"""
+    if not keys:
+        return
+    redis_client.delete(
+        *keys, *[response_key(key) for key in keys], *[negative_key(key) for key in keys]
+    )
+    logger.info(f"Invalidated {len(keys)} cache entries")
 
-        serialized = json.dumps(cache_data, default=str)
-        redis_client.setex(key, expire_time, serialized)
+    for key in keys:
+        invalidate_local(key)
+    publish_invalidation(keys)
+
+
+def invalidate_tag(tag: str):
+    """Synchronous version of ainvalidate_tag for threads and sync code"""
+    pipe = redis_client.pipeline(transaction=True)
+    members, _ = pipe.smembers(tag_key(tag)).delete(tag_key(tag)).execute()
+    invalidate_keys(list(members))
+
+
+def update_cache(key: str, data: Any, expire_time: int = 3600, tags: list[str] | None = None):
+    """Synchronous version of aupdate_cache for threads and sync code"""
+    if not can_write_through(data):
+        invalidate_keys([key])
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(key, expire_time, encode_cached(data, cached_at=time.time()))
+        pipe.delete(response_key(key))
+        for tag in tags or ():
+            pipe.sadd(tag_key(tag), key)
+            pipe.expire(tag_key(tag), expire_time)
+        pipe.execute()
         logger.info(f"Updated cache for key: {key}")
     except Exception as e:
-        logger.error(f"Failed to update cache: {e}")
\ No newline at end of file
+        logger.error(f"Failed to update cache: {e}")
+
+    invalidate_local(key)
+    publish_invalidation([key])
@@ -0,0 +1,29 @@
+import json
+import logging
+from typing import Any, Dict
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+# First byte of every encoded message. JSON payloads written before versioning start with '{'
+MSGPACK_V1 = b'\x01'
+
+
+class MessageCodec:
+    """Versioned encoding of Kafka message values: msgpack with a version byte, JSON for older messages"""
+
+    def __init__(self, format: str = 'msgpack'):
+        # 'json' keeps producing the old format while consumers are being upgraded
+        self.format = format
+
+    def encode(self, value: Dict[str, Any]) -> bytes:
+        if self.format == 'json':
+            return json.dumps(value).encode('utf-8')
+        return MSGPACK_V1 + msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        if data[:1] == MSGPACK_V1:
+            return msgpack.unpackb(data[1:], raw=False)
+        if data[:1] == b'{':
+            return json.loads(data.decode('utf-8'))
+        raise ValueError(f"Unknown message encoding version {data[:1]!r}")
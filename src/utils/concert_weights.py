@@ -0,0 +1,22 @@
+import logging
+from typing import Dict
+from src.utils.cache import redis_client, async_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ConcertWeights:
+    """Per-concert share of processor capacity, set by admins and read by every processor"""
+
+    def __init__(self):
+        self.key = 'concert-weights'
+
+    async def aset(self, concert_id: str, weight: float):
+        await async_redis_client.hset(self.key, concert_id, weight)
+        logger.info(f"Set processing weight of concert {concert_id} to {weight}")
+
+    def get_all(self) -> Dict[str, float]:
+        return {concert_id: float(weight) for concert_id, weight in redis_client.hgetall(self.key).items()}
+
+
+concert_weights = ConcertWeights()
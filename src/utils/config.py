@@ -7,8 +7,54 @@ class Settings():
     DATABASE_URL: str =  os.getenv('DATABASE_URL')
     REDIS_HOST: str = os.getenv('REDIS_HOST')
     REDIS_PORT: int = int(os.getenv('REDIS_PORT'))
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
     KAFKA_BOOTSTRAP_SERVERS: str = os.getenv('KAFKA_BOOTSTRAP_SERVERS')
+    KAFKA_METADATA_MAX_AGE_MS: int = int(os.getenv('KAFKA_METADATA_MAX_AGE_MS', 10000))
+    KAFKA_MESSAGE_FORMAT: str = os.getenv('KAFKA_MESSAGE_FORMAT', 'msgpack')
+    KAFKA_COMPRESSION: str = os.getenv('KAFKA_COMPRESSION', 'lz4')
+    RESULT_REGISTRY_MAX_SIZE: int = int(os.getenv('RESULT_REGISTRY_MAX_SIZE', 10000))
+    RESULT_REGISTRY_TTL: int = int(os.getenv('RESULT_REGISTRY_TTL', 60))
+    TICKET_STATUS_TTL: int = int(os.getenv('TICKET_STATUS_TTL', 3600))
+    TICKET_STATUS_STREAM_TIMEOUT: int = int(os.getenv('TICKET_STATUS_STREAM_TIMEOUT', 30))
+    PARTITIONS_PER_ZONE: int = int(os.getenv('PARTITIONS_PER_ZONE', 4))
+    ZONE_SPLIT_CACHE_TTL: int = int(os.getenv('ZONE_SPLIT_CACHE_TTL', 5))
+    PRODUCER_LINGER_MS: int = int(os.getenv('PRODUCER_LINGER_MS', 20))
+    PRODUCER_MAX_BATCH_SIZE: int = int(os.getenv('PRODUCER_MAX_BATCH_SIZE', 131072))
+    PRODUCER_PIPELINED: bool = os.getenv('PRODUCER_PIPELINED', 'true').lower() == 'true'
+    PRODUCER_DELIVERY_RETRIES: int = int(os.getenv('PRODUCER_DELIVERY_RETRIES', 3))
     BATCH_TIMEOUT: int = int(os.getenv('BATCH_TIMEOUT'))
+    FLUSH_MAX_BATCH_SIZE: int = int(os.getenv('FLUSH_MAX_BATCH_SIZE', 1000))
+    FLUSH_LATENCY_TARGET_MS: int = int(os.getenv('FLUSH_LATENCY_TARGET_MS', 500))
+    PERSIST_MAX_IN_FLIGHT: int = int(os.getenv('PERSIST_MAX_IN_FLIGHT', 2))
+    TICKET_QUEUE_MAX_SIZE: int = int(os.getenv('TICKET_QUEUE_MAX_SIZE', 20000))
+    TICKET_QUEUE_HIGH_WATERMARK: int = int(os.getenv('TICKET_QUEUE_HIGH_WATERMARK', 10000))
+    TICKET_QUEUE_LOW_WATERMARK: int = int(os.getenv('TICKET_QUEUE_LOW_WATERMARK', 5000))
+    FLUSH_MAX_RETRIES: int = int(os.getenv('FLUSH_MAX_RETRIES', 5))
+    FLUSH_RETRY_BACKOFF_MS: int = int(os.getenv('FLUSH_RETRY_BACKOFF_MS', 500))
+    FLUSH_RETRY_MAX_BACKOFF_MS: int = int(os.getenv('FLUSH_RETRY_MAX_BACKOFF_MS', 30000))
+    PROCESSOR_MANUAL_COMMIT: bool = os.getenv('PROCESSOR_MANUAL_COMMIT', 'true').lower() == 'true'
+    PROCESSOR_BATCH_SIZE: int = int(os.getenv('PROCESSOR_BATCH_SIZE', 500))
+    PROCESSOR_BATCH_MAX_WAIT_MS: int = int(os.getenv('PROCESSOR_BATCH_MAX_WAIT_MS', 50))
+    PROCESSOR_WORKERS: int = int(os.getenv('PROCESSOR_WORKERS', os.cpu_count() or 1))
+    PROCESSOR_METRICS_PORT: int = int(os.getenv('PROCESSOR_METRICS_PORT', 9101))
+    PROCESSOR_SHUTDOWN_TIMEOUT: int = int(os.getenv('PROCESSOR_SHUTDOWN_TIMEOUT', 30))
+    PROCESSOR_METRICS_DIR: str = os.getenv('PROCESSOR_METRICS_DIR', '/tmp/ticket-processor-metrics')
+    FAIR_MAX_CONCURRENCY: int = int(os.getenv('FAIR_MAX_CONCURRENCY', 4))
+    FAIR_WEIGHT_REFRESH_SECONDS: int = int(os.getenv('FAIR_WEIGHT_REFRESH_SECONDS', 10))
+    LANE_QUEUE_SIZE: int = int(os.getenv('LANE_QUEUE_SIZE', 10))
+    METADATA_CACHE_SIZE: int = int(os.getenv('METADATA_CACHE_SIZE', 10000))
+    METADATA_CACHE_TTL: int = int(os.getenv('METADATA_CACHE_TTL', 300))
+    CACHE_VERSION: str = os.getenv('CACHE_VERSION', 'v1')
+    LOCAL_CACHE_SIZE: int = int(os.getenv('LOCAL_CACHE_SIZE', 10000))
+    LOCAL_CACHE_TTL: int = int(os.getenv('LOCAL_CACHE_TTL', 60))
+    CACHE_SOFT_TTL_RATIO: float = float(os.getenv('CACHE_SOFT_TTL_RATIO', 0.8))
+    CACHE_XFETCH_BETA: float = float(os.getenv('CACHE_XFETCH_BETA', 1.0))
+    NEGATIVE_CACHE_TTL: int = int(os.getenv('NEGATIVE_CACHE_TTL', 30))
+    CACHE_LOCK_ENABLED: bool = os.getenv('CACHE_LOCK_ENABLED', 'false').lower() == 'true'
+    CACHE_LOCK_TTL_MS: int = int(os.getenv('CACHE_LOCK_TTL_MS', 3000))
+    CACHE_LOCK_POLL_MS: int = int(os.getenv('CACHE_LOCK_POLL_MS', 50))
+    RESPONSE_CACHE_ENABLED: bool = os.getenv('RESPONSE_CACHE_ENABLED', 'false').lower() == 'true'
+    RESPONSE_CACHE_TTL: int = int(os.getenv('RESPONSE_CACHE_TTL', 300))
 
 settings = Settings()
 
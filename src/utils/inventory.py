@@ -0,0 +1,188 @@
+import logging
+from src.utils.cache import redis_client, async_redis_client
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Atomically take one seat per ticket id in ARGV from a zone counter.
+# KEYS: zone counter, reserved set, then the share counters of a split zone with the caller's own share first.
+# A split zone reserves from its own share and borrows half of another counter once it runs dry. The zone
+# counter is one of those, since seats of shares dropped by a smaller split are released to it; and orders
+# still routed to a dropped share reserve from the zone counter and borrow from the remaining shares.
+# Ticket ids already in the reserved set are granted again without taking another seat,
+# so replaying an order after a restart is harmless.
+# Returns -1 when the counter has not been seeded yet, otherwise the granted ticket ids.
+RESERVE_SEATS_SCRIPT = """
+local counter_key = KEYS[1]
+if #KEYS >= 3 and redis.call('EXISTS', KEYS[3]) == 1 then
+    counter_key = KEYS[3]
+end
+local current = redis.call('GET', counter_key)
+if not current then
+    return -1
+end
+current = tonumber(current)
+local granted = {}
+for _, ticket_id in ipairs(ARGV) do
+    if redis.call('SISMEMBER', KEYS[2], ticket_id) == 1 then
+        table.insert(granted, ticket_id)
+    else
+        if current <= 0 then
+            for i = 1, #KEYS do
+                if i ~= 2 and KEYS[i] ~= counter_key then
+                    local sibling = tonumber(redis.call('GET', KEYS[i]) or '0')
+                    if sibling > 0 then
+                        local borrowed = math.ceil(sibling / 2)
+                        redis.call('DECRBY', KEYS[i], borrowed)
+                        current = current + borrowed
+                        break
+                    end
+                end
+            end
+        end
+        if current > 0 then
+            current = current - 1
+            redis.call('SADD', KEYS[2], ticket_id)
+            table.insert(granted, ticket_id)
+        end
+    end
+end
+redis.call('SET', counter_key, current)
+return granted
+"""
+
+# Give seats back for ticket ids that were reserved but could not be sold.
+# KEYS: zone counter, reserved set and optionally the share counter the seats came from
+RELEASE_SEATS_SCRIPT = """
+local released = redis.call('SREM', KEYS[2], unpack(ARGV))
+if released > 0 then
+    local counter_key = KEYS[1]
+    if #KEYS >= 3 and redis.call('EXISTS', KEYS[3]) == 1 then
+        counter_key = KEYS[3]
+    end
+    redis.call('INCRBY', counter_key, released)
+end
+return released
+"""
+
+# Spread the seats of a zone over ARGV[1] share counters, or fold them back into the zone counter when it is 1.
+# ARGV[1] = 0 keeps the current number of shares; ARGV[2], when given, replaces the total number of seats.
+# KEYS: zone counter, then every possible share counter. Returns -1 if the zone has not been seeded
+REDISTRIBUTE_SEATS_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return -1
+end
+local total = tonumber(current)
+local existing = 0
+for i = 2, #KEYS do
+    local share = redis.call('GET', KEYS[i])
+    if share then
+        total = total + tonumber(share)
+        existing = existing + 1
+        redis.call('DEL', KEYS[i])
+    end
+end
+if ARGV[2] then
+    total = tonumber(ARGV[2])
+end
+local shares = tonumber(ARGV[1])
+if shares == 0 then
+    shares = existing
+end
+shares = math.min(shares, #KEYS - 1)
+if shares <= 1 then
+    redis.call('SET', KEYS[1], total)
+    return total
+end
+redis.call('SET', KEYS[1], 0)
+for i = 0, shares - 1 do
+    local share = math.floor(total / shares)
+    if i < total % shares then
+        share = share + 1
+    end
+    redis.call('SET', KEYS[i + 2], share)
+end
+return total
+"""
+
+
+class SeatInventory:
+    def __init__(self, max_shares: int = 1):
+        self.key_prefix = 'seats'
+        # A hot zone can be split into at most one share per partition of the zone
+        self.max_shares = max_shares
+        self._reserve_script = redis_client.register_script(RESERVE_SEATS_SCRIPT)
+        self._release_script = redis_client.register_script(RELEASE_SEATS_SCRIPT)
+        self._redistribute_script = redis_client.register_script(REDISTRIBUTE_SEATS_SCRIPT)
+
+    def get_key(self, zone_id: str) -> str:
+        return f"{self.key_prefix}:{zone_id}"
+
+    def get_reserved_key(self, zone_id: str) -> str:
+        return f"{self.key_prefix}:{zone_id}:reserved"
+
+    def get_share_key(self, zone_id: str, share: int) -> str:
+        return f"{self.key_prefix}:{zone_id}:{share}"
+
+    def get_share_keys(self, zone_id: str, first: int = 0) -> list[str]:
+        """Every share counter of a zone, starting with the given share"""
+        order = [first] + [share for share in range(self.max_shares) if share != first]
+        return [self.get_share_key(zone_id, share) for share in order]
+
+    def seed(self, zone_id: str, available_seats: int) -> bool:
+        """Seed a zone counter from the database value, keeping any existing counter"""
+        seeded = redis_client.set(self.get_key(zone_id), max(int(available_seats), 0), nx=True)
+        if seeded:
+            logger.info(f"Seeded seat inventory for zone {zone_id} with {available_seats} seats")
+        return bool(seeded)
+
+    def reset(self, zone_id: str, available_seats: int):
+        """Overwrite a zone counter, e.g. after an admin changes the zone capacity, keeping its shares"""
+        redis_client.set(self.get_key(zone_id), 0, nx=True)
+        self._redistribute_script(
+            keys=[self.get_key(zone_id)] + self.get_share_keys(zone_id),
+            args=[0, max(int(available_seats), 0)]
+        )
+        logger.info(f"Reset seat inventory for zone {zone_id} to {available_seats} seats")
+
+    def redistribute(self, zone_id: str, shares: int) -> int | None:
+        """Spread the remaining seats of a zone over shares, one per sub-partition. Returns None if not seeded"""
+        total = self._redistribute_script(
+            keys=[self.get_key(zone_id)] + self.get_share_keys(zone_id),
+            args=[max(int(shares), 1)]
+        )
+        if total == -1:
+            return None
+        logger.info(f"Spread {total} seats of zone {zone_id} over {shares} shares")
+        return int(total)
+
+    def reserve(self, zone_id: str, ticket_ids: list[str], share: int = 0) -> list[str] | None:
+        """Reserve one seat per ticket id in one round trip. Returns None if the zone is not seeded"""
+        if not ticket_ids:
+            return []
+        granted = self._reserve_script(
+            keys=[self.get_key(zone_id), self.get_reserved_key(zone_id)] + self.get_share_keys(zone_id, share),
+            args=ticket_ids
+        )
+        if isinstance(granted, int):
+            return None
+        return list(granted)
+
+    def release(self, zone_id: str, ticket_ids: list[str], share: int = 0) -> int:
+        if not ticket_ids:
+            return 0
+        return int(self._release_script(
+            keys=[self.get_key(zone_id), self.get_reserved_key(zone_id), self.get_share_key(zone_id, share)],
+            args=ticket_ids
+        ))
+
+    async def aavailable(self, zone_id: str) -> int | None:
+        """Seats left in a zone, summed over its shares when it is split"""
+        values = await async_redis_client.mget([self.get_key(zone_id)] + self.get_share_keys(zone_id))
+        if values[0] is None:
+            return None
+        return sum(int(value) for value in values if value is not None)
+
+
+seat_inventory = SeatInventory(max_shares=settings.PARTITIONS_PER_ZONE)
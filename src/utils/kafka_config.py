@@ -1,13 +1,13 @@
 import os
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, ConsumerRebalanceListener
 from kafka import KafkaAdminClient
-import json
 from typing import Dict, Any, List
 import logging
 
 from kafka.admin import NewTopic
 
 from src.utils.config import Settings
+from src.utils.codec import MessageCodec
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,10 @@ class KafkaConfig:
         self.bootstrap_servers = Settings.KAFKA_BOOTSTRAP_SERVERS
         self.ticket_orders_topic = 'ticket-orders'
         self.ticket_events_topic = 'ticket-events'
+        self.ticket_dead_letter_topic = 'ticket-dead-letters'
         self.admin_client = None
+        self.codec = MessageCodec(format=Settings.KAFKA_MESSAGE_FORMAT)
+        self.reply_to_header = 'reply-to'
 
     def get_admin_client(self) -> KafkaAdminClient:
         """Get or create Kafka admin client for topic management"""
@@ -33,6 +36,17 @@ class KafkaConfig:
     def get_concert_events_topic(self, concert_id: str) -> str:
         return f"ticket-events-{concert_id}"
 
+    def get_concert_id_from_topic(self, topic: str) -> str:
+        return topic.split('-', 2)[-1]
+
+    def get_ticket_orders_pattern(self) -> str:
+        """Regex matching every concert order topic, including concerts created later"""
+        return r'^ticket-orders-.*'
+
+    def get_ticket_events_pattern(self) -> str:
+        """Regex matching every concert events topic, including concerts created later"""
+        return r'^ticket-events-.*'
+
     def create_concert_topics(self, concert_id: str, num_partitions: int = 3, replication_factor: int = 1):
         """Create topics for a specific concert"""
         try:
@@ -69,6 +83,18 @@ class KafkaConfig:
         except Exception as e:
             logger.error(f"Error creating topics for concert {concert_id}: {e}")
 
+    def get_partition_count(self, topic: str) -> int | None:
+        """Number of partitions of a topic, None when it does not exist"""
+        try:
+            admin_client = self.get_admin_client()
+            for description in admin_client.describe_topics([topic]):
+                if description['topic'] == topic and not description['error_code']:
+                    return len(description['partitions'])
+            return None
+        except Exception as e:
+            logger.error(f"Error describing topic {topic}: {e}")
+            return None
+
     def list_all_topics(self) -> List[str]:
         """List all concert-specific topics"""
         try:
@@ -95,7 +121,6 @@ class KafkaConfig:
             for topic_name in topics:
                 if  topic_name.startswith('ticket-orders-'):
                     ticket_order_topics.append(topic_name)
-            print(ticket_order_topics)
 
             return ticket_order_topics
         except Exception as e:
@@ -121,30 +146,42 @@ class KafkaConfig:
     def create_producer(self) -> AIOKafkaProducer:
         return AIOKafkaProducer(
             bootstrap_servers=self.bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            value_serializer=self.codec.encode,
             key_serializer=lambda k: k.encode('utf-8') if k else None,
             acks='all',  # Wait for all replicas to acknowledge
+            compression_type=Settings.KAFKA_COMPRESSION or None,
             retry_backoff_ms=100,
             request_timeout_ms=30000,
-            max_batch_size=16384,
-            linger_ms=10
+            # Only effective when sends are pipelined instead of awaited one by one
+            max_batch_size=Settings.PRODUCER_MAX_BATCH_SIZE,
+            linger_ms=Settings.PRODUCER_LINGER_MS
         )
 
-    def create_consumer(self, group_id: str, topics: list) -> AIOKafkaConsumer:
-        return AIOKafkaConsumer(
-            *topics,
+    def create_consumer(self, group_id: str, topics: list = None, listener: ConsumerRebalanceListener = None,
+                        enable_auto_commit: bool = True, pattern: str = None,
+                        auto_offset_reset: str = 'latest', raw_values: bool = False) -> AIOKafkaConsumer:
+        """Create a consumer subscribed to a topic list or, for topics created later, a regex pattern"""
+        consumer = AIOKafkaConsumer(
             bootstrap_servers=self.bootstrap_servers,
             group_id=group_id,
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            # With raw values the caller decodes only the messages it keeps
+            value_deserializer=None if raw_values else self.codec.decode,
             key_deserializer=lambda k: k.decode('utf-8') if k else None,
-            auto_offset_reset='latest',
-            enable_auto_commit=True,
+            auto_offset_reset=auto_offset_reset,
+            enable_auto_commit=enable_auto_commit,
             auto_commit_interval_ms=1000,
             session_timeout_ms=30000,
             heartbeat_interval_ms=10000,
             max_poll_records=100,
-            consumer_timeout_ms=1000
+            consumer_timeout_ms=1000,
+            # Pattern subscriptions discover new topics on each metadata refresh
+            metadata_max_age_ms=Settings.KAFKA_METADATA_MAX_AGE_MS
         )
+        if pattern:
+            consumer.subscribe(pattern=pattern, listener=listener)
+        else:
+            consumer.subscribe(topics=topics, listener=listener)
+        return consumer
 
     def create_concert_consumer(self, concert_id: str, group_id: str = None) -> AIOKafkaConsumer:
         """Create consumer for specific concert topics"""
@@ -164,7 +201,8 @@ kafka_config = KafkaConfig()
 
 # Event schemas
 class TicketOrderEvent:
-    def __init__(self, ticket_id: str, zone_id: str, concert_id: str ,user_id: str = None, timestamp: float = None):
+    def __init__(self, ticket_id: str, zone_id: str, concert_id: str ,user_id: str = None, timestamp: float = None,
+                 reply_to: str = None):
         import time
         self.ticket_id = ticket_id
         self.zone_id = zone_id
@@ -172,6 +210,8 @@ class TicketOrderEvent:
         # self.user_id = user_id
         self.timestamp = timestamp or time.time()
         self.status = 'pending'
+        # Instance id of the ordering service waiting for the result
+        self.reply_to = reply_to
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -180,21 +220,25 @@ class TicketOrderEvent:
             'concert_id': self.concert_id,
             # 'user_id': self.user_id,
             'timestamp': self.timestamp,
-            'status': self.status
+            'status': self.status,
+            'reply_to': self.reply_to
         }
 
 
 class TicketResultEvent:
+    """Outcome of an order. Zone and concert details are not embedded; consumers look them up by zone_id"""
     def __init__(self, ticket_id: str,zone_id: str ,concert_id: str,status: str, message: str = None,
-                 ticket_data: Dict[str, Any] = None, error: str = None):
+                 created_at: str = None, error: str = None, reply_to: str = None):
         import time
         self.ticket_id = ticket_id
         self.zone_id = zone_id
         self.concert_id = concert_id
         self.status = status  # 'success', 'failed', 'invalid'
         self.message = message
-        self.ticket_data = ticket_data
+        self.created_at = created_at
         self.error = error
+        # Sent as the reply-to header so other instances can skip the result without decoding it
+        self.reply_to = reply_to
         self.timestamp = time.time()
 
     def to_dict(self) -> Dict[str, Any]:
@@ -204,7 +248,7 @@ class TicketResultEvent:
             'concert_id': self.concert_id,
             'status': self.status,
             'message': self.message,
-            'ticket_data': self.ticket_data,
+            'created_at': self.created_at,
             'error': self.error,
             'timestamp': self.timestamp
         }
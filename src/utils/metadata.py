@@ -0,0 +1,115 @@
+import logging
+from typing import Any, Dict
+from src.utils.cache import TTLCache, subscribe_invalidations, apublish_invalidation
+from src.utils.config import settings
+from src.utils.database import SessionLocal
+from src.entities.zone import Zone
+from src.entities.concert import Concert
+
+logger = logging.getLogger(__name__)
+
+# Admin edits of zones and concerts are announced under these keys, apart from the cache keys
+# that every flush rewrites with fresh seat counts
+METADATA_PREFIX = 'meta:'
+
+
+def metadata_key(namespace: str, id: str) -> str:
+    return f"{METADATA_PREFIX}{namespace}:{id}"
+
+
+def build_ticket_detail(ticket_id: str, metadata: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+    """TicketDetail fields of a sold ticket, filled from its zone's metadata"""
+    return {
+        'id': ticket_id,
+        'zone_id': metadata['zone_id'],
+        'concert_id': metadata['concert_id'],
+        'created_at': created_at,
+        'updated_at': created_at,
+        'concert_name': metadata['concert_name'],
+        'concert_description': metadata['concert_description'],
+        'price': metadata['price'],
+        'zone_name': metadata['zone_name'],
+        'zone_description': metadata['zone_description']
+    }
+
+
+class ZoneMetadataCache:
+    """In-process cache of the static zone and concert fields needed to build a ticket"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.listening = False
+
+    def listen_for_invalidations(self):
+        """Drop entries when the admin service updates a zone or concert"""
+        if not self.listening:
+            subscribe_invalidations(self.invalidate)
+            self.listening = True
+
+    def get(self, zone_id: str) -> Dict[str, Any] | None:
+        metadata = self.cache.get(zone_id)
+        if metadata is None:
+            metadata = self.load(zone_id)
+            if metadata is not None:
+                self.cache.set(zone_id, metadata)
+        return metadata
+
+    def ticket_detail(self, ticket_id: str, zone_id: str, created_at: str) -> Dict[str, Any] | None:
+        metadata = self.get(zone_id)
+        if metadata is None:
+            return None
+        return build_ticket_detail(ticket_id, metadata, created_at)
+
+    def get_cached(self, zone_id: str) -> Dict[str, Any] | None:
+        """Metadata of a zone only if it is already cached, never touching the database"""
+        return self.cache.get(zone_id)
+
+    def load(self, zone_id: str) -> Dict[str, Any] | None:
+        db = SessionLocal()
+        try:
+            row = db.query(
+                Zone.concert_id, Zone.zone_number, Zone.name, Zone.price, Zone.description,
+                Concert.name, Concert.description, Concert.num_zones
+            ).join(Concert, Zone.concert_id == Concert.id).filter(Zone.id == zone_id).first()
+        finally:
+            db.close()
+
+        if row is None:
+            return None
+
+        (concert_id, zone_number, zone_name, price, zone_description,
+         concert_name, concert_description, num_zones) = row
+        logger.info(f"Loaded metadata for zone {zone_id}")
+        return {
+            'zone_id': zone_id,
+            'concert_id': concert_id,
+            'zone_number': zone_number,
+            'zone_name': zone_name,
+            'price': float(price),
+            'zone_description': zone_description,
+            'concert_name': concert_name,
+            'concert_description': concert_description,
+            'num_zones': num_zones
+        }
+
+    def invalidate(self, key: str):
+        if not key.startswith(METADATA_PREFIX):
+            return
+        namespace, _, id = key[len(METADATA_PREFIX):].partition(':')
+        if namespace == 'zone':
+            self.cache.delete(id)
+        elif namespace == 'concert':
+            self.cache.delete_where(lambda zone_id, metadata: metadata['concert_id'] == id)
+
+
+async def apublish_metadata_change(namespace: str, id: str):
+    """Drop the metadata of an edited zone or concert here and in every other process"""
+    key = metadata_key(namespace, id)
+    zone_metadata.invalidate(key)
+    await apublish_invalidation([key])
+
+
+zone_metadata = ZoneMetadataCache(
+    maxsize=settings.METADATA_CACHE_SIZE,
+    ttl=settings.METADATA_CACHE_TTL
+)
@@ -0,0 +1,68 @@
+import hashlib
+import logging
+from typing import Any
+from fastapi import Request, Response
+from pydantic import BaseModel
+from src.utils.cache import async_redis_client, local_cache, cache_locally, response_key
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (ETag, JSON body)
+RenderedResponse = tuple[str, bytes]
+
+
+class ResponseCache:
+    """Fully rendered JSON bodies of read endpoints, returned on a hit without decoding or validation"""
+
+    def __init__(self, enabled: bool = False, ttl: int = 300):
+        self.enabled = enabled
+        self.ttl = ttl
+
+    async def get(self, key: str) -> RenderedResponse | None:
+        if not self.enabled:
+            return None
+
+        rendered = local_cache.get(response_key(key))
+        if rendered is not None:
+            return rendered
+
+        try:
+            value = await async_redis_client.get(response_key(key))
+        except Exception as e:
+            logger.error(f"Failed to read cached response for key {key}: {e}")
+            return None
+        if not value:
+            return None
+
+        etag, body = value.split('\n', 1)
+        rendered = (etag, body.encode('utf-8'))
+        cache_locally(response_key(key), rendered, self.ttl)
+        return rendered
+
+    async def render(self, key: str, schema: type[BaseModel], obj: Any) -> RenderedResponse:
+        """Render a result through its response model once and cache the body"""
+        body = schema.model_validate(obj).model_dump_json()
+        digest = hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+        etag = f'"{digest}"'
+
+        try:
+            await async_redis_client.setex(response_key(key), self.ttl, f"{etag}\n{body}")
+        except Exception as e:
+            logger.error(f"Failed to cache response for key {key}: {e}")
+
+        rendered = (etag, body.encode('utf-8'))
+        cache_locally(response_key(key), rendered, self.ttl)
+        return rendered
+
+    def respond(self, rendered: RenderedResponse, request: Request) -> Response:
+        etag, body = rendered
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers={'ETag': etag})
+        return Response(content=body, media_type='application/json', headers={'ETag': etag})
+
+
+response_cache = ResponseCache(
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+    ttl=settings.RESPONSE_CACHE_TTL
+)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+from src.utils.cache import redis_client, async_redis_client
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TicketStatusStore:
+    """Outcome of each ticket order in Redis, so clients can poll instead of holding a request open"""
+
+    def __init__(self, ttl: int = 3600):
+        self.key_prefix = 'ticket-status'
+        self.ttl = ttl
+        # Every change is also published on the status key; one connection per process carries all watched orders
+        self.pubsub = None
+        self.listener_task = None
+        self.watchers: Dict[str, set[asyncio.Queue]] = {}
+
+    def get_key(self, ticket_id: str) -> str:
+        return f"{self.key_prefix}:{ticket_id}"
+
+    async def aset_pending(self, ticket_id: str, zone_id: str, concert_id: str):
+        await async_redis_client.setex(self.get_key(ticket_id), self.ttl, json.dumps({
+            'ticket_id': ticket_id,
+            'zone_id': zone_id,
+            'concert_id': concert_id,
+            'status': 'pending'
+        }))
+
+    def set_results(self, results: List[Dict[str, Any]]):
+        """Record the outcome of a batch of orders in one round trip"""
+        pipe = redis_client.pipeline(transaction=False)
+        for result in results:
+            key = self.get_key(result['ticket_id'])
+            value = json.dumps({
+                'ticket_id': result['ticket_id'],
+                'zone_id': result['zone_id'],
+                'concert_id': result['concert_id'],
+                'status': result['status'],
+                'created_at': result.get('created_at'),
+                'error': result.get('error')
+            })
+            pipe.setex(key, self.ttl, value)
+            pipe.publish(key, value)
+        pipe.execute()
+
+    async def aget(self, ticket_id: str) -> Dict[str, Any] | None:
+        value = await async_redis_client.get(self.get_key(ticket_id))
+        return json.loads(value) if value else None
+
+    async def adelete(self, ticket_id: str):
+        await async_redis_client.delete(self.get_key(ticket_id))
+
+    @asynccontextmanager
+    async def awatch(self, ticket_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving every status recorded for an order while the context is open"""
+        key = self.get_key(ticket_id)
+        queue = asyncio.Queue()
+        if self.pubsub is None:
+            self.pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+        self.watchers.setdefault(key, set()).add(queue)
+        try:
+            await self.pubsub.subscribe(key)
+            if self.listener_task is None:
+                self.listener_task = asyncio.create_task(self.listen())
+            yield queue
+        finally:
+            watchers = self.watchers.get(key)
+            watchers.discard(queue)
+            if not watchers:
+                del self.watchers[key]
+                try:
+                    await self.pubsub.unsubscribe(key)
+                except Exception as e:
+                    logger.error(f"Failed to unsubscribe from {key}: {e}")
+
+    async def listen(self):
+        """Hand published statuses to the watchers of their order, until nobody is watching"""
+        while self.watchers:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                logger.error(f"Error reading ticket status changes: {e}")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                continue
+            for queue in self.watchers.get(message['channel'], ()):
+                queue.put_nowait(json.loads(message['data']))
+        self.listener_task = None
+
+
+ticket_status = TicketStatusStore(ttl=settings.TICKET_STATUS_TTL)
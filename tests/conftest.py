@@ -0,0 +1,21 @@
+import os
+from dotenv import load_dotenv
+
+# Settings are read at import time; fall back to the sample values for anything not set
+load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env.sample'))
+
+# The database module must be imported before the entities that depend on its Base
+import src.utils.database  # noqa: E402,F401
+
+import fakeredis  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def fake_redis():
+    """Sync and async clients of one in-memory Redis server, with Lua scripting"""
+    server = fakeredis.FakeServer()
+    return (
+        fakeredis.FakeRedis(server=server, decode_responses=True),
+        fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    )
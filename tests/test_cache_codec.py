@@ -0,0 +1,84 @@
+from datetime import datetime
+from src.entities.concert import Concert
+from src.entities.zone import Zone
+from src.entities.ticket import Ticket
+from src.dto.concert import ConcertDetail
+from src.dto.ticket import TicketDetail
+from src.utils.cache import encode_cached, decode_cached, decode_entry, can_write_through, cached_type_of
+
+NOW = datetime(2026, 1, 1, 20, 0)
+
+
+def make_concert(**kwargs) -> Concert:
+    return Concert(
+        id='c1', venue_id='v1', name='Concert', start_time=NOW, end_time=NOW, num_zones=2,
+        description='Description', location='Hall', created_at=NOW, updated_at=NOW, **kwargs
+    )
+
+
+def make_zone(zone_number: int) -> Zone:
+    return Zone(
+        id=f"zon_c1_z{zone_number}", concert_id='c1', name=f"Zone {zone_number}", price=50.0,
+        zone_capacity=100, available_seats=80, zone_number=zone_number, description='Zone',
+        created_at=NOW, updated_at=NOW
+    )
+
+
+def test_concert_with_zones_round_trip():
+    concert = make_concert(zones=[make_zone(1), make_zone(2)])
+    assert can_write_through(concert)
+
+    record = decode_cached(encode_cached(concert))
+
+    assert cached_type_of(record) == 'Concert'
+    assert record.id == 'c1'
+    assert record.start_time == NOW
+    assert [zone.zone_number for zone in record.zones] == [1, 2]
+    assert record.zones[0].available_seats == 80
+    assert cached_type_of(record.zones[0]) == 'Zone'
+
+    detail = ConcertDetail.model_validate(record)
+    assert [zone.id for zone in detail.zones] == ['zon_c1_z1', 'zon_c1_z2']
+
+
+def test_concert_without_loaded_zones_round_trip():
+    concert = make_concert()
+    # Unloaded relationships are left out rather than cached as empty
+    assert not can_write_through(concert)
+
+    record = decode_cached(encode_cached(concert))
+
+    assert record.name == 'Concert'
+    assert record.zones == []
+    assert ConcertDetail.model_validate(record).zones == []
+
+
+def test_records_do_not_share_relationship_lists():
+    first = decode_cached(encode_cached(make_concert()))
+    second = decode_cached(encode_cached(make_concert()))
+
+    first.zones.append(make_zone(1))
+    assert second.zones == []
+
+
+def test_entry_keeps_load_time_and_duration():
+    ticket = Ticket(id='t1', zone_id='zon_c1_z1', created_at=NOW, updated_at=NOW)
+
+    record, cached_at, delta = decode_entry(encode_cached(ticket, cached_at=1000.0, delta=0.25))
+
+    assert record.id == 't1'
+    assert record.created_at == NOW
+    assert (cached_at, delta) == (1000.0, 0.25)
+
+
+def test_ticket_detail_round_trip():
+    detail = TicketDetail(
+        id='t1', zone_id='zon_c1_z1', concert_id='c1', created_at=NOW, updated_at=NOW,
+        concert_name='Concert', concert_description='Description', price=50.0,
+        zone_name='Zone 1', zone_description='Zone'
+    )
+
+    decoded = decode_cached(encode_cached(detail))
+
+    assert isinstance(decoded, TicketDetail)
+    assert decoded == detail
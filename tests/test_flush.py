@@ -0,0 +1,41 @@
+from src.kafka.flush import FlushController
+
+
+def test_flushes_on_batch_size():
+    controller = FlushController(max_batch_size=10, max_age=60, latency_target=0.5)
+
+    assert not controller.should_flush(9, 0.0)
+    assert controller.should_flush(10, 0.0)
+
+
+def test_never_flushes_empty_buffer():
+    controller = FlushController(max_batch_size=10, max_age=60, latency_target=0.5)
+
+    assert not controller.should_flush(0, 100.0)
+    assert controller.time_until_flush(0, 0.0, idle_timeout=2.0) == 2.0
+
+
+def test_deadline_leaves_room_for_the_flush():
+    controller = FlushController(max_batch_size=10, max_age=60, latency_target=0.5)
+    controller.record_flush(0.2, 5)
+
+    assert controller.deadline() == 0.3
+    assert not controller.should_flush(1, 0.29)
+    assert controller.should_flush(1, 0.3)
+    assert abs(controller.time_until_flush(1, 0.1) - 0.2) < 1e-9
+
+
+def test_deadline_is_capped_by_max_age_and_never_negative():
+    controller = FlushController(max_batch_size=10, max_age=0.1, latency_target=0.5)
+    assert controller.deadline() == 0.1
+
+    controller.record_flush(2.0, 5)
+    assert controller.deadline() == 0.0
+
+
+def test_flush_duration_is_smoothed():
+    controller = FlushController(max_batch_size=10, max_age=60, latency_target=0.5, smoothing=0.5)
+    controller.record_flush(0.2, 5)
+    controller.record_flush(0.4, 5)
+
+    assert abs(controller.flush_duration - 0.3) < 1e-9
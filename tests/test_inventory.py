@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+import src.utils.inventory as inventory_module
+from src.utils.inventory import SeatInventory
+
+
+@pytest.fixture
+def inventory(fake_redis, monkeypatch):
+    client, async_client = fake_redis
+    monkeypatch.setattr(inventory_module, 'redis_client', client)
+    monkeypatch.setattr(inventory_module, 'async_redis_client', async_client)
+    return SeatInventory(max_shares=4)
+
+
+def total_seats(inventory: SeatInventory, zone_id: str) -> int:
+    values = inventory_module.redis_client.mget([inventory.get_key(zone_id)] + inventory.get_share_keys(zone_id))
+    return sum(int(value) for value in values if value is not None)
+
+
+def test_reserve_requires_seeded_counter(inventory):
+    assert inventory.reserve('z1', ['t1']) is None
+
+
+def test_reserve_stops_at_zero_and_replays_are_free(inventory):
+    inventory.seed('z1', 2)
+
+    assert inventory.reserve('z1', ['t1', 't2', 't3']) == ['t1', 't2']
+    # A replayed order gets its seat again without taking another one
+    assert inventory.reserve('z1', ['t1', 't4']) == ['t1']
+    assert total_seats(inventory, 'z1') == 0
+
+
+def test_seed_keeps_existing_counter(inventory):
+    inventory.seed('z1', 5)
+    inventory.reserve('z1', ['t1'])
+
+    assert not inventory.seed('z1', 5)
+    assert total_seats(inventory, 'z1') == 4
+
+
+def test_release_returns_seats_once(inventory):
+    inventory.seed('z1', 1)
+    inventory.reserve('z1', ['t1'])
+
+    assert inventory.release('z1', ['t1']) == 1
+    assert inventory.release('z1', ['t1']) == 0
+    assert inventory.reserve('z1', ['t2']) == ['t2']
+
+
+def test_split_share_borrows_from_siblings(inventory):
+    inventory.seed('z1', 8)
+    assert inventory.redistribute('z1', 4) == 8
+
+    granted = inventory.reserve('z1', [f"t{i}" for i in range(8)], share=0)
+
+    # Share 0 starts with 2 seats and borrows the rest, so every seat of the zone is sold from it
+    assert len(granted) == 8
+    assert inventory.reserve('z1', ['t8'], share=1) == []
+
+
+def test_reducing_split_with_orders_in_flight(inventory):
+    inventory.seed('z1', 8)
+    inventory.redistribute('z1', 4)
+    assert inventory.reserve('z1', ['early'], share=3) == ['early']
+
+    # The split goes from 4 to 2 shares; shares 2 and 3 are dropped
+    assert inventory.redistribute('z1', 2) == 7
+
+    # Orders still routed to a dropped share reserve from the remaining shares instead of failing
+    assert inventory.reserve('z1', ['late'], share=3) == ['late']
+
+    # A seat released by an order of a dropped share lands on the zone counter and can be sold again
+    assert inventory.release('z1', ['early'], share=3) == 1
+    granted = inventory.reserve('z1', [f"t{i}" for i in range(10)], share=0)
+    assert len(granted) == 7
+    assert total_seats(inventory, 'z1') == 0
+
+
+def test_redistribute_folds_shares_back(inventory):
+    inventory.seed('z1', 6)
+    inventory.redistribute('z1', 3)
+    inventory.reserve('z1', ['t1'], share=2)
+
+    assert inventory.redistribute('z1', 1) == 5
+    assert inventory.reserve('z1', [f"t{i}" for i in range(2, 10)]) == [f"t{i}" for i in range(2, 7)]
+
+
+def test_reset_keeps_split(inventory):
+    inventory.seed('z1', 4)
+    inventory.redistribute('z1', 2)
+
+    inventory.reset('z1', 10)
+
+    assert total_seats(inventory, 'z1') == 10
+    assert len(inventory.reserve('z1', [f"t{i}" for i in range(12)], share=1)) == 10
+
+
+def test_available_sums_shares(inventory):
+    inventory.seed('z1', 9)
+    inventory.redistribute('z1', 3)
+    inventory.reserve('z1', ['t1'], share=1)
+
+    assert asyncio.run(inventory.aavailable('z1')) == 8
+    assert asyncio.run(inventory.aavailable('z2')) is None
@@ -0,0 +1,105 @@
+import asyncio
+from aiokafka import TopicPartition
+from src.kafka.lanes import LaneScheduler
+
+HOT = TopicPartition('ticket-orders-c1', 0)
+COLD = TopicPartition('ticket-orders-c1', 1)
+
+
+class Consumer:
+    """The pause/resume surface of AIOKafkaConsumer that the scheduler uses"""
+
+    def __init__(self, partitions):
+        self.partitions = set(partitions)
+        self.paused_partitions = set()
+
+    def assignment(self):
+        return self.partitions
+
+    def paused(self):
+        return self.paused_partitions
+
+    def pause(self, *partitions):
+        self.paused_partitions.update(partitions)
+
+    def resume(self, *partitions):
+        self.paused_partitions.difference_update(partitions)
+
+
+def test_full_lane_pauses_its_partition_without_blocking_others():
+    handled = []
+    release_hot = asyncio.Event()
+
+    async def handler(item):
+        if item[0] == 'hot':
+            await release_hot.wait()
+        handled.append(item)
+
+    async def main():
+        scheduler = LaneScheduler(handler, maxsize=2)
+        consumer = Consumer([HOT, COLD])
+        scheduler.bind(consumer)
+        scheduler.assign([HOT, COLD])
+
+        for i in range(5):
+            # Never waits, even though the hot lane is stuck
+            await asyncio.wait_for(scheduler.dispatch(HOT, ('hot', i)), timeout=0.1)
+        await scheduler.dispatch(COLD, ('cold', 0))
+        await asyncio.sleep(0.01)
+
+        assert HOT in consumer.paused()
+        assert COLD not in consumer.paused()
+        assert handled == [('cold', 0)]
+
+        release_hot.set()
+        await scheduler.lanes[HOT].queue.join()
+        assert HOT not in consumer.paused()
+        await scheduler.stop()
+
+    asyncio.run(main())
+    assert [item for item in handled if item[0] == 'hot'] == [('hot', i) for i in range(5)]
+
+
+def test_lane_resumes_once_half_drained():
+    gate = asyncio.Event()
+
+    async def handler(item):
+        await gate.wait()
+
+    async def main():
+        scheduler = LaneScheduler(handler, maxsize=4)
+        consumer = Consumer([HOT])
+        scheduler.bind(consumer)
+
+        for i in range(4):
+            await scheduler.dispatch(HOT, i)
+        assert HOT in consumer.paused()
+
+        gate.set()
+        await scheduler.lanes[HOT].queue.join()
+        assert HOT not in consumer.paused()
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+
+def test_other_pause_reasons_keep_partition_paused():
+    async def handler(item):
+        pass
+
+    async def main():
+        scheduler = LaneScheduler(handler, maxsize=1)
+        consumer = Consumer([HOT])
+        scheduler.bind(consumer)
+
+        scheduler.pause(HOT, 'backpressure')
+        await scheduler.dispatch(HOT, 0)
+        await scheduler.lanes[HOT].queue.join()
+
+        # The lane drained, but backpressure still holds the partition
+        assert HOT in consumer.paused()
+        scheduler.resume(HOT, 'backpressure')
+        assert HOT not in consumer.paused()
+        await scheduler.stop()
+
+    asyncio.run(main())
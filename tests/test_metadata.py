@@ -0,0 +1,39 @@
+from src.utils.cache import build_cache_key
+from src.utils.metadata import ZoneMetadataCache, metadata_key
+
+
+def make_cache() -> ZoneMetadataCache:
+    metadata = ZoneMetadataCache(maxsize=10, ttl=60)
+    metadata.cache.set('z1', {'zone_id': 'z1', 'concert_id': 'c1'})
+    metadata.cache.set('z2', {'zone_id': 'z2', 'concert_id': 'c1'})
+    metadata.cache.set('z3', {'zone_id': 'z3', 'concert_id': 'c2'})
+    return metadata
+
+
+def test_seat_count_refreshes_keep_metadata():
+    metadata = make_cache()
+
+    # Every flush rewrites the cached zone rows; that must not evict static metadata
+    metadata.invalidate(build_cache_key('zone', 'z1'))
+    metadata.invalidate(build_cache_key('concert', 'c1'))
+
+    assert len(metadata.cache) == 3
+
+
+def test_zone_edit_drops_only_that_zone():
+    metadata = make_cache()
+
+    metadata.invalidate(metadata_key('zone', 'z1'))
+
+    assert metadata.get_cached('z1') is None
+    assert metadata.get_cached('z2') is not None
+
+
+def test_concert_edit_drops_its_zones():
+    metadata = make_cache()
+
+    metadata.invalidate(metadata_key('concert', 'c1'))
+
+    assert metadata.get_cached('z1') is None
+    assert metadata.get_cached('z2') is None
+    assert metadata.get_cached('z3') is not None
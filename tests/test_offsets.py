@@ -0,0 +1,103 @@
+from aiokafka import TopicPartition
+from src.kafka.offsets import OffsetTracker
+
+TP = TopicPartition('ticket-orders-c1', 0)
+
+
+def test_commits_up_to_first_outstanding_offset():
+    tracker = OffsetTracker()
+    tracker.track(TP, [0, 1, 2, 3])
+    tracker.deliver(TP, [0, 1, 2, 3])
+    tracker.complete(TP, [0, 1, 3])
+
+    # Offset 2 is still being persisted, so 3 must not be committed past it
+    assert tracker.committable() == {TP: 2}
+
+    tracker.complete(TP, [2])
+    assert tracker.committable() == {TP: 4}
+
+
+def test_gap_at_start_blocks_commit():
+    tracker = OffsetTracker()
+    tracker.track(TP, [10, 11, 12])
+    tracker.deliver(TP, [10, 11, 12])
+    tracker.complete(TP, [11, 12])
+
+    assert tracker.committable() == {TP: 10}
+
+
+def test_undelivered_results_block_commit():
+    tracker = OffsetTracker()
+    tracker.track(TP, [0, 1, 2])
+    tracker.complete(TP, [0, 1, 2])
+    assert tracker.committable() == {TP: 0}
+
+    tracker.deliver(TP, [0, 1])
+    assert tracker.committable() == {TP: 2}
+
+    tracker.deliver(TP, [2])
+    assert tracker.committable() == {TP: 3}
+
+
+def test_committed_offsets_are_not_offered_again():
+    tracker = OffsetTracker()
+    tracker.track(TP, [0, 1])
+    tracker.deliver(TP, [0, 1])
+    tracker.complete(TP, [0, 1])
+    tracker.mark_committed(tracker.committable())
+
+    assert tracker.committable() == {}
+
+    tracker.track(TP, [2])
+    tracker.deliver(TP, [2])
+    tracker.complete(TP, [2])
+    assert tracker.committable() == {TP: 3}
+
+
+def test_replayed_offsets_are_tracked_again():
+    tracker = OffsetTracker()
+    tracker.track(TP, [0, 1])
+    tracker.complete(TP, [0, 1])
+    tracker.deliver(TP, [1])
+
+    # The batch is replayed after its result for offset 0 was not delivered
+    tracker.track(TP, [0, 1])
+    assert tracker.committable() == {TP: 0}
+
+    tracker.complete(TP, [0, 1])
+    tracker.deliver(TP, [0, 1])
+    assert tracker.committable() == {TP: 2}
+
+
+def test_forget_drops_revoked_partitions():
+    other = TopicPartition('ticket-orders-c1', 1)
+    tracker = OffsetTracker()
+    tracker.track(TP, [0])
+    tracker.track(other, [0])
+    tracker.deliver(other, [0])
+    tracker.complete(other, [0])
+
+    tracker.forget([TP])
+
+    assert tracker.committable() == {other: 1}
+    # Late completions of a revoked partition are ignored
+    tracker.complete(TP, [0])
+    tracker.deliver(TP, [0])
+    assert TP not in tracker.committable()
+
+
+def test_committed_offset_never_moves_back():
+    tracker = OffsetTracker()
+    tracker.track(TP, [0, 1, 2, 3])
+    tracker.deliver(TP, [0, 1, 2, 3])
+    tracker.complete(TP, [0, 1])
+    older = tracker.committable()
+    tracker.complete(TP, [2, 3])
+    newer = tracker.committable()
+
+    # A slower commit of the older snapshot finishes last
+    tracker.mark_committed(newer)
+    tracker.mark_committed(older)
+
+    assert tracker.committed[TP] == 4
+    assert tracker.committable() == {}
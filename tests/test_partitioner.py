@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+import src.kafka.partitioner as partitioner_module
+from src.kafka.partitioner import ZonePartitioner
+from src.utils.metadata import zone_metadata
+
+NUM_ZONES = 3
+
+
+@pytest.fixture
+def partitioner(fake_redis, monkeypatch):
+    client, _ = fake_redis
+    monkeypatch.setattr(partitioner_module, 'redis_client', client)
+    for zone_number in range(1, NUM_ZONES + 1):
+        zone_metadata.cache.set(f"z{zone_number}", {'zone_number': zone_number, 'num_zones': NUM_ZONES})
+    yield ZonePartitioner(partitions_per_zone=4, split_ttl=0)
+    zone_metadata.cache.clear()
+
+
+def route(partitioner: ZonePartitioner, zone_id: str, ticket_ids: list[str], num_partitions: int) -> set[int]:
+    async def main():
+        return {await partitioner.partition(zone_id, ticket_id, num_partitions) for ticket_id in ticket_ids}
+    return asyncio.run(main())
+
+
+TICKETS = [f"t{i}" for i in range(200)]
+
+
+def test_unsplit_zone_uses_first_partition_of_its_block(partitioner):
+    assert route(partitioner, 'z1', TICKETS, 12) == {0}
+    assert route(partitioner, 'z3', TICKETS, 12) == {8}
+
+
+def test_split_zone_spreads_over_its_block(partitioner):
+    partitioner.set_split('z2', 3)
+
+    assert route(partitioner, 'z2', TICKETS, 12) == {4, 5, 6}
+    assert {partitioner.sub_partition(p, 12, NUM_ZONES) for p in (4, 5, 6)} == {0, 1, 2}
+    # Other zones are unaffected
+    assert route(partitioner, 'z1', TICKETS, 12) == {0}
+
+
+def test_split_is_capped_at_block_size(partitioner):
+    partitioner_module.redis_client.hset(partitioner.splits_key, 'z1', 10)
+
+    assert route(partitioner, 'z1', TICKETS, 12) == {0, 1, 2, 3}
+
+
+def test_undoing_split_routes_back_to_first_partition(partitioner):
+    partitioner.set_split('z1', 4)
+    partitioner.set_split('z1', 1)
+
+    assert route(partitioner, 'z1', TICKETS, 12) == {0}
+    assert partitioner_module.redis_client.hget(partitioner.splits_key, 'z1') is None
+
+
+def test_legacy_topic_ignores_splits(partitioner):
+    partitioner.set_split('z2', 4)
+
+    # One partition per zone: the zone keeps its own partition and share 0
+    assert route(partitioner, 'z2', TICKETS, NUM_ZONES) == {1}
+    assert partitioner.sub_partition(1, NUM_ZONES, NUM_ZONES) == 0
+    assert not partitioner.has_zone_blocks(NUM_ZONES, NUM_ZONES)
+    assert partitioner.has_zone_blocks(12, NUM_ZONES)
+
+
+def test_unknown_zone_is_rejected(partitioner, monkeypatch):
+    monkeypatch.setattr(zone_metadata, 'load', lambda zone_id: None)
+
+    with pytest.raises(ValueError):
+        route(partitioner, 'missing', ['t1'], 12)
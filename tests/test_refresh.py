@@ -0,0 +1,63 @@
+import asyncio
+import time
+import pytest
+import src.utils.cache as cache
+from src.utils.cache import needs_refresh, build_cache_key, encode_cached
+from src.utils.config import settings
+from tests.test_cache_codec import make_concert, make_zone
+from tests.test_single_flight import ConcertRepository
+
+
+def test_entries_without_load_time_never_refresh():
+    assert not needs_refresh(None, 10.0, 60)
+
+
+def test_entries_past_soft_ttl_always_refresh():
+    assert all(needs_refresh(time.time() - 61, 0.0, 60) for _ in range(100))
+
+
+def test_fresh_cheap_entries_do_not_refresh_early():
+    assert not any(needs_refresh(time.time(), 0.0, 60) for _ in range(100))
+
+
+def test_expensive_entries_refresh_early_near_expiry(monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_XFETCH_BETA', 1.0)
+    cached_at = time.time() - 58
+
+    # With loads taking 5s, 2s before the soft TTL a refresh is due more often than not
+    slow = sum(needs_refresh(cached_at, 5.0, 60) for _ in range(1000))
+    fast = sum(needs_refresh(cached_at, 0.01, 60) for _ in range(1000))
+
+    assert slow > 500
+    assert fast < 10
+
+
+@pytest.fixture
+def redis(fake_redis, monkeypatch):
+    _, async_client = fake_redis
+    monkeypatch.setattr(cache, 'async_redis_client', async_client)
+    monkeypatch.setattr(settings, 'CACHE_LOCK_ENABLED', False)
+    return async_client
+
+
+def test_stale_entry_is_served_and_refreshed_once(redis):
+    renamed = make_concert(zones=[make_zone(1)])
+    renamed.name = 'Renamed'
+    repository = ConcertRepository({'c1': renamed})
+    cache_key = build_cache_key('concert', 'c1')
+    stale = encode_cached(make_concert(zones=[make_zone(1)]), cached_at=time.time() - 3600)
+
+    async def main():
+        await redis.setex(cache_key, 60, stale)
+        first, second = await asyncio.gather(repository.get('c1'), repository.get('c1'))
+        await asyncio.gather(*cache._refresh_tasks)
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    # Both requests get the stale value immediately; one background load replaces it
+    assert first.name == second.name == 'Concert'
+    assert repository.loads == 1
+    assert not cache._refreshes_in_flight
+    refreshed = cache.decode_cached(asyncio.run(redis.get(cache_key)))
+    assert refreshed.name == 'Renamed'
@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime
+import src.kafka.consumer as consumer
+import src.utils.cache as cache
+from src.dto.ticket import TicketDetail
+from src.kafka.consumer import TicketResultConsumer
+from src.utils.cache import build_cache_key, get_many_cached, decode_entry
+
+RESULT = {
+    'ticket_id': 'tic_1',
+    'status': 'success',
+    'ticket_data': {
+        'ticket_id': 'tic_1', 'zone_id': 'zon_c1_z1', 'concert_id': 'c1', 'concert_name': 'Concert',
+        'price': 50.0, 'zone_name': 'Zone 1', 'created_at': '2026-01-01T20:00:00', 'updated_at': '2026-01-01T20:00:00'
+    }
+}
+
+
+def test_cached_result_is_readable_by_the_cache_layer(fake_redis, monkeypatch):
+    _, async_client = fake_redis
+    monkeypatch.setattr(cache, 'async_redis_client', async_client)
+    monkeypatch.setattr(consumer, 'async_redis_client', async_client)
+    results = TicketResultConsumer()
+
+    async def main():
+        await results.cache_ticket_result('tic_1', RESULT)
+        cache.local_cache.delete(build_cache_key('ticket_detail', 'tic_1'))
+        return (
+            await async_client.get(build_cache_key('ticket_detail', 'tic_1')),
+            await get_many_cached([build_cache_key('ticket_detail', 'tic_1')], TicketDetail),
+            await results.get_cached_result('tic_1')
+        )
+
+    entry, [detail], cached_result = asyncio.run(main())
+
+    # Written by encode_cached, so the entry carries its load time for the soft TTL
+    _, cached_at, _ = decode_entry(entry)
+    assert cached_at is not None
+    assert isinstance(detail, TicketDetail)
+    assert detail.id == 'tic_1'
+    assert detail.created_at == datetime(2026, 1, 1, 20, 0)
+    assert cached_result['id'] == 'tic_1'
+    assert cached_result['concert_id'] == 'c1'
+    assert TicketDetail(**cached_result) == detail
@@ -0,0 +1,67 @@
+import asyncio
+from src.kafka.results import ResultRegistry
+
+
+def test_resolved_result_reaches_waiter():
+    registry = ResultRegistry(maxsize=10, ttl=60)
+
+    async def main():
+        registry.register('t1')
+        assert registry.resolve('t1', {'status': 'success'})
+        return await registry.wait('t1', timeout=1)
+
+    assert asyncio.run(main()) == {'status': 'success'}
+    assert len(registry) == 0
+
+
+def test_results_nobody_waits_for_are_dropped():
+    registry = ResultRegistry(maxsize=10, ttl=60)
+
+    assert not registry.resolve('t1', {'status': 'success'})
+    assert not registry.is_waiting('t1')
+
+
+def test_wait_times_out():
+    registry = ResultRegistry(maxsize=10, ttl=60)
+
+    assert asyncio.run(registry.wait('t1', timeout=0.01)) is None
+    assert len(registry) == 0
+
+
+def test_oldest_waiter_is_evicted_when_full():
+    registry = ResultRegistry(maxsize=2, ttl=60)
+
+    async def main():
+        first = registry.register('t1')
+        registry.register('t2')
+        registry.register('t3')
+        return await first
+
+    assert asyncio.run(main()) is None
+    assert not registry.is_waiting('t1')
+    assert registry.is_waiting('t2') and registry.is_waiting('t3')
+
+
+def test_expired_waiters_are_evicted():
+    registry = ResultRegistry(maxsize=10, ttl=0)
+
+    async def main():
+        first = registry.register('t1')
+        registry.register('t2')
+        return first
+
+    first = asyncio.run(main())
+    assert first.result() is None
+    assert not registry.is_waiting('t1')
+
+
+def test_discard_cancels_waiter():
+    registry = ResultRegistry(maxsize=10, ttl=60)
+
+    async def main():
+        future = registry.register('t1')
+        registry.discard('t1')
+        return future
+
+    assert asyncio.run(main()).cancelled()
+    assert len(registry) == 0
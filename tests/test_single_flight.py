@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+import src.utils.cache as cache
+from src.entities.concert import Concert
+from src.utils.cache import cache_data, build_cache_key, negative_key
+from src.utils.config import settings
+from tests.test_cache_codec import make_concert, make_zone
+
+
+@pytest.fixture
+def redis(fake_redis, monkeypatch):
+    _, async_client = fake_redis
+    monkeypatch.setattr(cache, 'async_redis_client', async_client)
+    monkeypatch.setattr(cache, '_release_lock_script', async_client.register_script(cache._release_lock_script.script))
+    monkeypatch.setattr(settings, 'CACHE_LOCK_ENABLED', False)
+    monkeypatch.setattr(settings, 'CACHE_LOCK_POLL_MS', 5)
+    return async_client
+
+
+class ConcertRepository:
+    model = Concert
+    cache_namespace = 'concert'
+
+    def __init__(self, rows: dict):
+        self.rows = rows
+        self.loads = 0
+
+    def cache_tags(self, obj) -> list[str]:
+        return []
+
+    @cache_data(expire_time=60)
+    async def get(self, id: str):
+        self.loads += 1
+        await asyncio.sleep(0.01)
+        return self.rows.get(id)
+
+
+def gather(*coroutines):
+    async def main():
+        return await asyncio.gather(*coroutines)
+    return asyncio.run(main())
+
+
+def test_concurrent_misses_share_one_load(redis):
+    repository = ConcertRepository({'c1': make_concert(zones=[make_zone(1)])})
+
+    results = gather(*(repository.get('c1') for _ in range(5)))
+
+    assert repository.loads == 1
+    assert all(result.id == 'c1' and len(result.zones) == 1 for result in results)
+    assert not cache._loads_in_flight
+
+
+def test_concurrent_misses_of_missing_record_share_one_load(redis):
+    repository = ConcertRepository({})
+
+    assert gather(*(repository.get('c1') for _ in range(5))) == [None] * 5
+    assert repository.loads == 1
+
+    # The negative entry answers later lookups without the database
+    assert asyncio.run(redis.exists(negative_key(build_cache_key('concert', 'c1'))))
+    assert gather(repository.get('c1')) == [None]
+    assert repository.loads == 1
+
+
+def test_waiters_load_themselves_when_result_cannot_be_cached(redis):
+    # Zones are not loaded, so the record is not written through and there is nothing to share
+    repository = ConcertRepository({'c1': make_concert()})
+
+    results = gather(*(repository.get('c1') for _ in range(3)))
+
+    assert all(result is not None and result.id == 'c1' for result in results)
+    assert repository.loads == 3
+
+
+def test_lock_waiter_honours_negative_entry(redis, monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_LOCK_ENABLED', True)
+    repository = ConcertRepository({'c1': make_concert(zones=[])})
+    cache_key = build_cache_key('concert', 'c1')
+
+    async def other_process():
+        # Another process holds the load lock, finds nothing and records the miss
+        await redis.set(f"lock:{cache_key}", 'other')
+        await asyncio.sleep(0.03)
+        await redis.setex(negative_key(cache_key), 30, 1)
+        await redis.delete(f"lock:{cache_key}")
+
+    async def main():
+        holder = asyncio.create_task(other_process())
+        await asyncio.sleep(0)
+        result = await repository.get('c1')
+        await holder
+        return result
+
+    assert asyncio.run(main()) is None
+    assert repository.loads == 0
+
+
+def test_lock_waiter_uses_entry_cached_by_holder(redis, monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_LOCK_ENABLED', True)
+    repository = ConcertRepository({})
+    cache_key = build_cache_key('concert', 'c1')
+
+    async def other_process():
+        await redis.set(f"lock:{cache_key}", 'other')
+        await asyncio.sleep(0.03)
+        await redis.setex(cache_key, 60, cache.encode_cached(make_concert(zones=[make_zone(1)])))
+        await redis.delete(f"lock:{cache_key}")
+
+    async def main():
+        holder = asyncio.create_task(other_process())
+        await asyncio.sleep(0)
+        result = await repository.get('c1')
+        await holder
+        return result
+
+    result = asyncio.run(main())
+    assert result.id == 'c1' and isinstance(result.zones[0].zone_number, int)
+    assert repository.loads == 0
+
+
+def test_lock_holder_releases_lock(redis, monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_LOCK_ENABLED', True)
+    repository = ConcertRepository({'c1': make_concert(zones=[])})
+
+    assert gather(repository.get('c1'))[0].id == 'c1'
+    assert not asyncio.run(redis.exists(f"lock:{build_cache_key('concert', 'c1')}"))